@@ -5,30 +5,75 @@ Orchestrates all components and handles startup/shutdown
 """
 
 import asyncio
+import gzip
 import signal
 import sys
 import os
 import shutil
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from datetime import datetime
-import yaml
+from typing import Optional
 from dotenv import load_dotenv
 
-# Add src directory to path
-sys.path.append(str(Path(__file__).parent / "src"))
-
+# `src` is imported as a package from the script directory (already sys.path[0])
 from src.engine import TradingEngine
 from src.discord_bot import DiscordNotifier
 from src.database import DatabaseManager
+from src.config import BotConfig, apply_env_overrides, load_yaml_config
+
+# Seconds allowed for engine.stop() (run_bot.sh force-kills after 30s)
+SHUTDOWN_GRACE_PERIOD = 25
+
+# OKX credential keys that must be set (via config.yml or environment)
+REQUIRED_OKX = frozenset({'api_key', 'secret_key', 'passphrase'})
+
+# Pre-logging startup messages, encoded once and written to fd 1 in a single call
+_MSG_CONFIG_COPIED = "ℹ️  config.yml not found. Copied from config_template.yml.\n".encode()
+_MSG_CONFIG_MISSING = (
+    "❌ Configuration file 'config.yml' not found!\n"
+    "📋 Please copy 'config_template.yml' to 'config.yml' and configure your settings.\n"
+    "🔑 Don't forget to set up your .env file with API keys!\n"
+).encode()
+_MSG_ENV_MISSING = (
+    "⚠️  Environment file '.env' not found and required variables are missing!\n"
+    "📋 Please copy '.env.example' to '.env' and add your API keys, or set them in the environment.\n"
+).encode()
+_MSG_ENV_FALLBACK = "ℹ️  .env file not found, using environment variables.\n".encode()
+
+# Log formats, defined once; loguru compiles each when its sink is added
+_CONSOLE_FMT = sys.intern(
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+_FILE_FMT = sys.intern("{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}")
+
+# Single worker so rotated-log compressions run one at a time, off the logger
+_log_compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+
+
+def _gzip_rotated_log(path: str):
+    """Gzip a rotated log file and remove the uncompressed copy"""
+    try:
+        with open(path, 'rb') as source, gzip.open(f"{path}.gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
+    except Exception as e:
+        logger.warning(f"Failed to compress rotated log {path}: {e}")
+
+
+def _compress_in_background(path: str):
+    """Loguru compression hook: hand the rotated file to the compressor thread"""
+    _log_compressor.submit(_gzip_rotated_log, path)
 
 
 class TradingBotManager:
     """Main trading bot manager"""
     
-    def __init__(self, config_path: str = "config.yml"):
+    def __init__(self, config_path: str = "config.yml", config_stat: Optional[os.stat_result] = None):
         """Initialize trading bot manager"""
         self.config_path = config_path
+        self.config_stat = config_stat
         self.config = None
         self.engine = None
         self.running = False
@@ -46,50 +91,48 @@ class TradingBotManager:
         # Remove default logger
         logger.remove()
         
-        # Add console logger
+        # Add console logger (colour markup only when a terminal will render it;
+        # Docker/systemd capture stdout through a pipe)
+        is_tty = sys.stdout.isatty()
         logger.add(
             sys.stdout,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            format=_CONSOLE_FMT if is_tty else _FILE_FMT,
+            colorize=is_tty,
             level="INFO"
         )
         
-        # Add file logger
+        # Add file logger (enqueue=True hands file writes to a background
+        # worker so disk I/O never runs on the trading event loop)
         log_dir = "logs"
         os.makedirs(log_dir, exist_ok=True)
         
         logger.add(
             f"{log_dir}/trading_bot.log",
-            rotation="10 MB",
+            rotation="50 MB",
             retention="30 days",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            level="DEBUG"
-        )
-        
-        # Add error file logger
-        logger.add(
-            f"{log_dir}/errors.log",
-            rotation="10 MB",
-            retention="90 days",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            level="ERROR"
+            compression=_compress_in_background,
+            format=_FILE_FMT,
+            level="DEBUG",
+            enqueue=True
         )
     
-    def _load_config(self) -> dict:
+    def _load_config(self) -> BotConfig:
         """Load configuration from file"""
         try:
-            if not os.path.exists(self.config_path):
+            try:
+                config_stat = self.config_stat or os.stat(self.config_path)
+            except FileNotFoundError:
                 logger.error(f"Configuration file not found: {self.config_path}")
                 logger.info("Please copy config_template.yml to config.yml and configure your settings")
                 sys.exit(1)
             
-            with open(self.config_path, 'r') as file:
-                config = yaml.safe_load(file)
+            config = load_yaml_config(self.config_path, config_stat.st_mtime_ns)
             
             # Load environment variables into config
             self._load_env_variables(config)
             
             logger.info(f"Configuration loaded from {self.config_path}")
-            return config
+            return BotConfig.from_dict(config)
         
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
@@ -98,17 +141,7 @@ class TradingBotManager:
     def _load_env_variables(self, config: dict):
         """Load environment variables into configuration"""
         try:
-            # OKX API credentials
-            if 'okx' in config:
-                config['okx']['api_key'] = os.getenv('OKX_API_KEY', config['okx'].get('api_key', ''))
-                config['okx']['secret_key'] = os.getenv('OKX_SECRET_KEY', config['okx'].get('secret_key', ''))
-                config['okx']['passphrase'] = os.getenv('OKX_PASSPHRASE', config['okx'].get('passphrase', ''))
-            
-            # Discord configuration
-            if 'discord' in config:
-                config['discord']['bot_token'] = os.getenv('DISCORD_BOT_TOKEN', config['discord'].get('bot_token', ''))
-                config['discord']['channel_id'] = os.getenv('DISCORD_CHANNEL_ID', config['discord'].get('channel_id', ''))
-                config['discord']['webhook_url'] = os.getenv('DISCORD_WEBHOOK_URL', config['discord'].get('webhook_url', ''))
+            apply_env_overrides(config)
             
             # Validate required credentials
             self._validate_credentials(config)
@@ -119,8 +152,8 @@ class TradingBotManager:
     
     def _validate_credentials(self, config: dict):
         """Validate required credentials"""
-        required_okx = ['api_key', 'secret_key', 'passphrase']
-        missing_okx = [key for key in required_okx if not config.get('okx', {}).get(key)]
+        okx = config.get('okx') or {}
+        missing_okx = sorted(key for key in REQUIRED_OKX if not okx.get(key))
         
         if missing_okx:
             logger.error(f"Missing OKX credentials: {missing_okx}")
@@ -134,16 +167,28 @@ class TradingBotManager:
             logger.warning("Discord bot token not configured - notifications will be disabled")
     
     def _setup_signal_handlers(self):
-        """Setup signal handlers for graceful shutdown"""
-        def signal_handler(signum, frame):
-            logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            self.running = False
+        """Route shutdown signals through the running event loop"""
+        loop = asyncio.get_running_loop()
+        shutdown_signals = [signal.SIGINT, signal.SIGTERM]
+        if hasattr(signal, 'SIGHUP'):
+            shutdown_signals.append(signal.SIGHUP)
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for sig in shutdown_signals:
+            try:
+                loop.add_signal_handler(sig, self._request_stop, sig)
+            except NotImplementedError:
+                # Windows event loops lack add_signal_handler; hand off thread-safely instead
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self._request_stop, signum))
+    
+    def _request_stop(self, signum: int):
+        """Stop the trading loop; shutdown() then runs from start()'s finally block"""
+        if not self.running:
+            return
         
-        if hasattr(signal, 'SIGHUP'):
-            signal.signal(signal.SIGHUP, signal_handler)
+        logger.info(f"Received signal {signal.Signals(signum).name}, initiating graceful shutdown...")
+        self.running = False
+        if self.engine:
+            self.engine.running = False
     
     async def start(self):
         """Start the trading bot"""
@@ -155,9 +200,6 @@ class TradingBotManager:
             # Load configuration
             self.config = self._load_config()
             
-            # Setup signal handlers
-            self._setup_signal_handlers()
-            
             # Display configuration summary
             self._display_config_summary()
             
@@ -167,9 +209,10 @@ class TradingBotManager:
             
             # Start the engine
             self.running = True
-            logger.info("Starting trading engine...")
+            self._setup_signal_handlers()
             
-            # Run the trading engine
+            # start() connects exchange, Discord and database in parallel once
+            # running is set, so a shutdown signal during connect is honoured
             await self.engine.start()
         
         except KeyboardInterrupt:
@@ -182,15 +225,19 @@ class TradingBotManager:
     
     def _display_config_summary(self):
         """Display configuration summary"""
-        logger.info("Configuration Summary:")
-        logger.info(f"  Initial Capital: £{self.config['trading']['initial_capital']}")
-        logger.info(f"  Risk per Trade: {self.config['trading']['risk_per_trade']*100}%")
-        logger.info(f"  Max Risk Amount: £{self.config['trading']['max_risk_amount']}")
-        logger.info(f"  Max Active Pairs: {self.config['trading']['max_active_pairs']}")
-        logger.info(f"  Timeframe: {self.config['trading']['strategy']['timeframe']}")
-        logger.info(f"  Sandbox Mode: {self.config['okx']['sandbox']}")
-        logger.info(f"  Discord Notifications: {'Enabled' if self.config['discord'].get('bot_token') else 'Disabled'}")
-        logger.info(f"  AI Assistant: {'Enabled' if self.config['ai_assistant']['enabled'] else 'Disabled'}")
+        trading = self.config.trading
+        summary = "\n".join([
+            "Configuration Summary:",
+            f"  Initial Capital: £{trading.initial_capital}",
+            f"  Risk per Trade: {trading.risk_per_trade*100}%",
+            f"  Max Risk Amount: £{trading.max_risk_amount}",
+            f"  Max Active Pairs: {trading.max_active_pairs}",
+            f"  Timeframe: {trading.timeframe}",
+            f"  Sandbox Mode: {self.config.okx.sandbox}",
+            f"  Discord Notifications: {'Enabled' if self.config.discord.enabled else 'Disabled'}",
+            f"  AI Assistant: {'Enabled' if self.config.ai_assistant.enabled else 'Disabled'}"
+        ])
+        logger.info(summary)
     
     async def shutdown(self):
         """Graceful shutdown"""
@@ -198,11 +245,16 @@ class TradingBotManager:
             logger.info("Initiating graceful shutdown...")
             
             if self.engine:
-                await self.engine.stop()
+                await asyncio.wait_for(self.engine.stop(), timeout=SHUTDOWN_GRACE_PERIOD)
             
             logger.info("Trading bot shutdown complete")
             logger.info("=" * 60)
+
+            # Drain queued file-log records before the process exits
+            await logger.complete()
         
+        except asyncio.TimeoutError:
+            logger.error(f"Engine shutdown exceeded {SHUTDOWN_GRACE_PERIOD}s grace period")
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
 
@@ -212,15 +264,16 @@ async def main():
     try:
         # Check for config file (fallback to template for cloud deploys)
         config_path = "config.yml"
-        if not os.path.exists(config_path):
+        try:
+            config_stat = os.stat(config_path)
+        except FileNotFoundError:
             template_path = "config_template.yml"
             if os.path.exists(template_path):
                 shutil.copy(template_path, config_path)
-                print("ℹ️  config.yml not found. Copied from config_template.yml.")
+                config_stat = os.stat(config_path)
+                os.write(1, _MSG_CONFIG_COPIED)
             else:
-                print("❌ Configuration file 'config.yml' not found!")
-                print("📋 Please copy 'config_template.yml' to 'config.yml' and configure your settings.")
-                print("🔑 Don't forget to set up your .env file with API keys!")
+                os.write(1, _MSG_CONFIG_MISSING)
                 sys.exit(1)
         
         # Check for .env file (allow env vars in cloud deployments)
@@ -228,14 +281,12 @@ async def main():
             required_vars = ["OKX_API_KEY", "OKX_SECRET_KEY", "OKX_PASSPHRASE"]
             missing = [var for var in required_vars if not os.getenv(var)]
             if missing:
-                print("⚠️  Environment file '.env' not found and required variables are missing!")
-                print("📋 Please copy '.env.example' to '.env' and add your API keys, or set them in the environment.")
-                print(f"🔑 Missing: {', '.join(missing)}")
+                os.write(1, _MSG_ENV_MISSING + f"🔑 Missing: {', '.join(missing)}\n".encode())
                 sys.exit(1)
-            print("ℹ️  .env file not found, using environment variables.")
+            os.write(1, _MSG_ENV_FALLBACK)
         
         # Create and start bot manager
-        bot_manager = TradingBotManager(config_path)
+        bot_manager = TradingBotManager(config_path, config_stat)
         await bot_manager.start()
     
     except Exception as e:
@@ -198,10 +198,10 @@ show_logs() {
             fi
             ;;
         "error"|"errors")
-            if [ -f "$LOG_DIR/errors.log" ]; then
-                tail -f "$LOG_DIR/errors.log"
+            if [ -f "$LOG_DIR/trading_bot.log" ]; then
+                tail -f "$LOG_DIR/trading_bot.log" | grep --line-buffered -E '\| (ERROR|CRITICAL) '
             else
-                error "Error log file not found: $LOG_DIR/errors.log"
+                error "Log file not found: $LOG_DIR/trading_bot.log"
             fi
             ;;
         "output")
@@ -363,7 +363,6 @@ show_help() {
     echo ""
     echo "Log files:"
     echo "  $LOG_DIR/trading_bot.log    # Main application logs"
-    echo "  $LOG_DIR/errors.log         # Error logs"
     echo "  $LOG_DIR/bot_output.log     # Bot stdout/stderr"
     echo ""
 }
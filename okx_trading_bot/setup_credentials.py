@@ -68,14 +68,18 @@ MAX_DAILY_LOSS=50.0
 LOG_LEVEL=INFO
 """
     
-    # Write .env file
+    # Write .env file via a temp file + rename so a crash never leaves it truncated
+    tmp_path = env_path.with_name(".env.tmp")
     try:
-        with open(env_path, 'w') as f:
+        with open(tmp_path, 'w') as f:
+            # Set file permissions (Unix-like systems) before any secret is written
+            if os.name != 'nt':
+                os.chmod(tmp_path, 0o600)
             f.write(env_content)
+            f.flush()
+            os.fsync(f.fileno())
         
-        # Set file permissions (Unix-like systems)
-        if os.name != 'nt':
-            os.chmod(env_path, 0o600)
+        os.replace(tmp_path, env_path)
         
         print()
         print("=" * 60)
@@ -97,6 +101,8 @@ LOG_LEVEL=INFO
         
     except Exception as e:
         print(f"❌ Error creating .env file: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
         return False
 
 if __name__ == "__main__":
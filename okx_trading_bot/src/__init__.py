@@ -8,14 +8,19 @@ __version__ = "1.0.0"
 __author__ = "Autonomous Trading Systems"
 __description__ = "High-frequency cryptocurrency trading bot for OKX with AI-enhanced decision making"
 
-# Core modules
-from .engine import TradingEngine
-from .indicators import TechnicalIndicators
-from .risk import RiskManager
-from .okx_client import OKXClient
-from .discord_bot import DiscordNotifier
-from .ai_assistant import AIAssistant
-from .reporter import ReportGenerator
+import importlib
+
+# Core modules are resolved lazily (PEP 562) so importing one submodule
+# does not pull pandas, discord.py, ccxt and friends in with it
+_LAZY_IMPORTS = {
+    "TradingEngine": ".engine",
+    "TechnicalIndicators": ".indicators",
+    "RiskManager": ".risk",
+    "OKXClient": ".okx_client",
+    "DiscordNotifier": ".discord_bot",
+    "AIAssistant": ".ai_assistant",
+    "ReportGenerator": ".reporter"
+}
 
 __all__ = [
     "TradingEngine",
@@ -26,3 +31,16 @@ __all__ = [
     "AIAssistant",
     "ReportGenerator"
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,7 +8,10 @@ Enhanced with Ollama AI integration for free, powerful AI capabilities
 import numpy as np
 import pandas as pd
 import asyncio
+import functools
+import gzip
 import time
+from collections import deque
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -16,11 +19,18 @@ from loguru import logger
 import json
 import os
 import pickle
+import re
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import Ollama service
 try:
     from .ollama_service import OllamaService
@@ -30,9 +40,132 @@ except ImportError:
     logger.warning("Ollama service not available - using fallback methods only")
 
 
+# JSON decoding for model replies (orjson when installed) and the outermost
+# {...} span, used to pull a JSON object out of surrounding chatter
+_loads = orjson.loads if orjson else json.loads
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+
+# Research pattern families used by the heuristic config suggestions
+REVERSAL_PATTERNS = frozenset({"double_bottom", "double_top", "hammer", "engulfing", "doji"})
+TREND_PATTERNS = frozenset({"higher_highs", "lower_lows"})
+
+# Indicators summarised in the chart-signal and trade-gating prompts
+PROMPT_INDICATOR_KEYS = ('rsi', 'macd_histogram', 'bb_width', 'ema_short', 'ema_long')
+
+# Prompt templates, filled with str.format_map (literal braces are doubled)
+_CHART_PROMPT = (
+    "Read the chart summary and respond with JSON only: "
+    "{{\"action\":\"buy|sell|hold\",\"confidence\":0-1,\"reason\":\"...\"}}\n\n"
+    "Symbol: {symbol}\n"
+    "Last close: {last_close:.6f}\n"
+    "Change(50): {change_pct:.2f}%\n"
+    "High(50): {high:.6f} Low(50): {low:.6f}\n"
+    "Volume(50): {volume:.2f}\n"
+    "RSI: {rsi}\n"
+    "MACD_hist: {macd_histogram}\n"
+    "BB_width: {bb_width}\n"
+    "EMA_short: {ema_short} "
+    "EMA_long: {ema_long}\n"
+)
+_GATE_PROMPT = (
+    "Evaluate this trade signal and respond in JSON with keys "
+    "`approve` (true/false), `confidence` (0-1), and `reason`.\n\n"
+    "Signal: action={action}, confidence={confidence:.2f}, "
+    "entry={entry:.6f}, stop={stop:.6f}, take_profit={take_profit:.6f}\n"
+    "Indicators: rsi={rsi}, macd_hist={macd_histogram}, bb_width={bb_width}, "
+    "ema_short={ema_short}, ema_long={ema_long}"
+)
+_GATE_SHORT_PROMPT = (
+    "Evaluate trade signal. Respond in JSON with keys approve, confidence, reason.\n"
+    "action={action}, confidence={confidence:.2f}, "
+    "entry={entry:.6f}, stop={stop:.6f}, take_profit={take_profit:.6f}"
+)
+
+# Indicators included in each symbol's pattern-detection snapshot
+PATTERN_INDICATOR_KEYS = ('rsi', 'macd_line', 'macd_histogram', 'bb_upper', 'bb_lower')
+
+# Stand-in for indicators that were not computed
+_NO_VALUES = np.empty(0)
+
+# Parameter values quoted in free-text Ollama suggestions (matched on lowercased text)
+_RSI_VALUE_RE = re.compile(r'rsi.*?(\d+)')
+_MACD_VALUE_RE = re.compile(r'macd.*?(\d+)')
+_RISK_VALUE_RE = re.compile(r'risk.*?([\d.]+)')
+
+# Indicator keyword in suggestion text -> enable/disable parameter
+INDICATOR_TOGGLES = {
+    "stochastic": "enable_stochastic",
+    "williams": "enable_williams_r",
+    "cci": "enable_cci",
+    "rsi": "enable_rsi",
+    "macd": "enable_macd",
+    "bollinger": "enable_bollinger_bands",
+    "ema": "enable_ema",
+    "vwap": "enable_vwap"
+}
+
+# Finds every toggle keyword in one scan; the lookahead also reports
+# keywords that overlap another one (e.g. "ema" inside "emacd")
+_INDICATOR_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, INDICATOR_TOGGLES)) + '))')
+
+# Indicators treated as enabled when the config does not say otherwise
+DEFAULT_ON_INDICATORS = frozenset({"rsi", "macd", "bollinger_bands", "ema", "vwap"})
+
+
+def _pivot_indices(prices: np.ndarray, lows: bool) -> np.ndarray:
+    """Indices of bars 5..14 strictly below (or above) the two bars on each side"""
+    # One 5-bar window per candidate bar (centre at column 2), compared at once
+    windows = sliding_window_view(prices[3:17], 5)
+    centre = windows[:, 2:3]
+    neighbours = windows[:, [0, 1, 3, 4]]
+    is_pivot = (neighbours > centre).all(axis=1) if lows else (neighbours < centre).all(axis=1)
+    return np.flatnonzero(is_pivot) + 5
+
+
+# Trades kept in memory for learning
+TRADE_HISTORY_LIMIT = 1000
+
+
+@functools.lru_cache(maxsize=16)
+def _performance_metrics(pnls: Tuple[float, ...]) -> Dict:
+    """Performance metrics for a sequence of trade P&Ls"""
+    return _pnl_metrics(np.fromiter(pnls, dtype=np.float64, count=len(pnls)))
+
+
+def _pnl_metrics(pnl: np.ndarray) -> Dict:
+    """Performance metrics for a float64 P&L array"""
+    total_trades = len(pnl)
+    if total_trades == 0:
+        return {}
+    
+    wins = pnl > 0
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(-pnl[pnl < 0].sum())
+    
+    win_rate = float(np.count_nonzero(wins) / total_trades)
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+    
+    # Max drawdown of the cumulative P&L curve
+    cumulative = np.cumsum(pnl)
+    max_drawdown = float((np.maximum.accumulate(cumulative) - cumulative).max())
+    
+    return {
+        'win_rate': win_rate,
+        'total_trades': total_trades,
+        'net_pnl': float(cumulative[-1]),
+        'profit_factor': profit_factor,
+        'max_drawdown': max_drawdown,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss
+    }
+
+
 @dataclass
 class ParameterSuggestion:
     """Parameter optimization suggestion"""
+    # Explicit __slots__ (Python 3.8 compatible): no per-instance __dict__
+    __slots__ = ('parameter', 'current_value', 'suggested_value', 'confidence',
+                 'reason', 'expected_improvement')
     parameter: str
     current_value: Any
     suggested_value: Any
@@ -44,6 +177,8 @@ class ParameterSuggestion:
 @dataclass
 class PatternMatch:
     """Market pattern match result"""
+    __slots__ = ('pattern_name', 'confidence', 'historical_success_rate',
+                 'recommended_action', 'risk_level')
     pattern_name: str
     confidence: float
     historical_success_rate: float
@@ -57,6 +192,7 @@ class AIAssistant:
     
     def __init__(self, config: Dict):
         """Initialize AI assistant"""
+        self._current_params_cache: Optional[Dict] = None
         self.config = config
         self.ai_config = config.get('ai_assistant', {})
         self.enabled = self.ai_config.get('enabled', True)
@@ -83,6 +219,15 @@ class AIAssistant:
         self.min_confidence = self.ai_config.get('min_confidence', 0.7)
         self.lookback_period = self.ai_config.get('lookback_period', 30)
         
+        # The _simulate_* backtests are random placeholders: skip the parameter
+        # sweeps built on them until a real backtester is wired in
+        self._sim_is_stub = True
+        # Independent generators per optimiser: they run concurrently on executor
+        # threads and a numpy Generator is not thread-safe
+        self._rsi_rng, self._macd_rng, self._bollinger_rng = (
+            np.random.default_rng(seed) for seed in np.random.SeedSequence().spawn(3)
+        )
+        
         # Initialize Ollama service (free AI)
         self.ollama = None
         self.use_ollama = self.ai_config.get('use_ollama', True) and OLLAMA_AVAILABLE
@@ -95,8 +240,8 @@ class AIAssistant:
                 if self.ollama.is_available():
                     logger.info(f"Ollama AI enabled with model: {ollama_model}")
                 else:
-                    logger.warning("Ollama not available, using fallback methods")
-                    self.use_ollama = False
+                    # Keep the service: _ollama_ready() re-probes it periodically
+                    logger.warning("Ollama not available, using fallback methods until it responds")
             except Exception as e:
                 logger.warning(f"Failed to initialize Ollama: {e}. Using fallback methods.")
                 self.use_ollama = False
@@ -107,17 +252,66 @@ class AIAssistant:
         self.scaler = StandardScaler()
         
         # Data storage
-        self.trade_history = []
+        self.trade_history = deque(maxlen=TRADE_HISTORY_LIMIT)
+        # Columnar copy of the trade P&Ls and close times (epoch ns), so metrics
+        # scan one float array instead of the dicts. Twice the history limit is
+        # allocated so the slab is compacted only once every TRADE_HISTORY_LIMIT trades.
+        self._pnl_arr = np.empty(2 * TRADE_HISTORY_LIMIT, dtype=np.float64)
+        self._ts_arr = np.empty(2 * TRADE_HISTORY_LIMIT, dtype=np.int64)
+        self._n_trades = 0
         self.market_patterns = {}
         self.parameter_performance = {}
         self.research_stats = {}
-        self._gate_lock = asyncio.Lock()
+        self._gate_sem = asyncio.Semaphore(max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "2"))))
         self._last_signal_time: Dict[str, float] = {}
         
-        # Pattern templates
+        # Pattern templates, plus a struct-of-arrays view of their success rates
+        # (name -> row index) so research updates reduce in one pass
         self.pattern_templates = self._initialize_pattern_templates()
+        self._tmpl_idx = {name: i for i, name in enumerate(self.pattern_templates)}
+        self._tmpl_success = np.array(
+            [template['success_rate'] for template in self.pattern_templates.values()], dtype=float
+        )
+        self._cache_template_rates()
         
-        logger.info("AI assistant initialized" + (" with Ollama" if self.use_ollama else " (fallback mode)"))
+        logger.info("AI assistant initialized" + (" with Ollama" if self.use_ollama and self.ollama.is_available() else " (fallback mode)"))
+
+    @property
+    def config(self) -> Dict:
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict):
+        # The engine reassigns config after applying updates; rebuild derived views
+        self._config = value
+        self._current_params_cache = None
+
+    def _current_params(self) -> Dict:
+        """Tunable parameters from config, rebuilt only when the config is replaced"""
+        if self._current_params_cache is None:
+            trading = self.config['trading']
+            indicators = trading['indicators']
+            self._current_params_cache = {
+                'rsi_period': indicators['rsi']['period'],
+                'macd_fast': indicators['macd']['fast_period'],
+                'risk_per_trade': trading['risk_per_trade'],
+                'bollinger_std': indicators['bollinger_bands']['std_dev'],
+                'enable_rsi': indicators.get('rsi', {}).get('enabled', True),
+                'enable_macd': indicators.get('macd', {}).get('enabled', True),
+                'enable_bollinger_bands': indicators.get('bollinger_bands', {}).get('enabled', True),
+                'enable_ema': indicators.get('ema', {}).get('enabled', True),
+                'enable_vwap': indicators.get('vwap', {}).get('enabled', True),
+                'enable_stochastic': indicators.get('stochastic', {}).get('enabled', False),
+                'enable_williams_r': indicators.get('williams_r', {}).get('enabled', False),
+                'enable_cci': indicators.get('cci', {}).get('enabled', False)
+            }
+        return dict(self._current_params_cache)
+
+    async def _ollama_ready(self) -> bool:
+        """Whether Ollama can be used now (health check cached by the service)"""
+        if not self.use_ollama or not self.ollama:
+            return False
+        return await self.ollama.refresh_availability()
 
     async def generate_signal_from_chart(
         self,
@@ -129,7 +323,7 @@ class AIAssistant:
         try:
             if not self.enabled or not self.signal_generation_enabled:
                 return None
-            if not self.use_ollama or not self.ollama or not self.ollama.is_available():
+            if not await self._ollama_ready():
                 return None
             if df is None or df.empty:
                 return None
@@ -148,28 +342,21 @@ class AIAssistant:
 
             change_pct = (close.iloc[-1] - close.iloc[0]) / close.iloc[0] if close.iloc[0] else 0.0
 
-            rsi = indicators.get('rsi', pd.Series()).iloc[-1] if isinstance(indicators.get('rsi'), pd.Series) else indicators.get('rsi')
-            macd_hist = indicators.get('macd_histogram', pd.Series()).iloc[-1] if isinstance(indicators.get('macd_histogram'), pd.Series) else indicators.get('macd_histogram')
-            bb_width = indicators.get('bb_width', pd.Series()).iloc[-1] if isinstance(indicators.get('bb_width'), pd.Series) else indicators.get('bb_width')
-            ema_short = indicators.get('ema_short', pd.Series()).iloc[-1] if isinstance(indicators.get('ema_short'), pd.Series) else indicators.get('ema_short')
-            ema_long = indicators.get('ema_long', pd.Series()).iloc[-1] if isinstance(indicators.get('ema_long'), pd.Series) else indicators.get('ema_long')
-
-            prompt = (
-                "Read the chart summary and respond with JSON only: "
-                "{\"action\":\"buy|sell|hold\",\"confidence\":0-1,\"reason\":\"...\"}\n\n"
-                f"Symbol: {symbol}\n"
-                f"Last close: {float(close.iloc[-1]):.6f}\n"
-                f"Change(50): {change_pct*100:.2f}%\n"
-                f"High(50): {float(high.max()):.6f} Low(50): {float(low.min()):.6f}\n"
-                f"Volume(50): {float(volume.sum()):.2f}\n"
-                f"RSI: {float(rsi) if rsi is not None else 'N/A'}\n"
-                f"MACD_hist: {float(macd_hist) if macd_hist is not None else 'N/A'}\n"
-                f"BB_width: {float(bb_width) if bb_width is not None else 'N/A'}\n"
-                f"EMA_short: {float(ema_short) if ema_short is not None else 'N/A'} "
-                f"EMA_long: {float(ema_long) if ema_long is not None else 'N/A'}\n"
+            fields = {
+                key: float(value) if value is not None else 'N/A'
+                for key, value in self._last_scalars(indicators, PROMPT_INDICATOR_KEYS).items()
+            }
+            fields.update(
+                symbol=symbol,
+                last_close=float(close.iloc[-1]),
+                change_pct=change_pct * 100,
+                high=float(high.max()),
+                low=float(low.min()),
+                volume=float(volume.sum())
             )
+            prompt = _CHART_PROMPT.format_map(fields)
 
-            response = self.ollama.generate(prompt, temperature=0.2, max_tokens=120)
+            response = await self.ollama.generate(prompt, temperature=0.2, max_tokens=120)
             if not response:
                 return None
             response = response.strip()
@@ -178,13 +365,12 @@ class AIAssistant:
             confidence = 0.0
             reason = "AI chart signal"
 
-            json_match = None
-            if "{" in response and "}" in response:
-                json_match = response[response.find("{"):response.rfind("}") + 1]
+            match = _JSON_OBJECT_RE.search(response)
+            json_match = match.group(0) if match else None
 
             if json_match:
                 try:
-                    data = json.loads(json_match)
+                    data = _loads(json_match)
                     action = str(data.get("action", "hold")).lower()
                     confidence = float(data.get("confidence", 0.0))
                     reason = data.get("reason", reason)
@@ -219,6 +405,23 @@ class AIAssistant:
             logger.error(f"Error generating AI chart signal: {e}")
             return None
 
+    async def close(self):
+        """Release the Ollama client's pooled connections"""
+        if getattr(self, 'ollama', None):
+            await self.ollama.close()
+
+    @staticmethod
+    def _last_scalars(indicators: Dict, keys: Tuple[str, ...]) -> Dict[str, Any]:
+        """Latest value of each indicator (None for missing or empty series)"""
+        out = {}
+        for key in keys:
+            value = indicators.get(key)
+            if isinstance(value, pd.Series):
+                out[key] = value.iloc[-1] if len(value) else None
+            else:
+                out[key] = value
+        return out
+
     def _log_ai_signal(self, entry: Dict[str, Any]):
         """Log AI chart signals to file"""
         try:
@@ -264,6 +467,15 @@ class AIAssistant:
             }
         }
     
+    def _cache_template_rates(self):
+        """Copy template success rates into plain attributes read by the per-candle detectors"""
+        templates = self.pattern_templates
+        self._success_bull = templates['bullish_divergence']['success_rate']
+        self._success_bear = templates['bearish_divergence']['success_rate']
+        self._success_squeeze = templates['bollinger_squeeze']['success_rate']
+        self._success_macd = templates['macd_golden_cross']['success_rate']
+        self._success_volume = templates['volume_spike']['success_rate']
+    
     async def analyze_performance(self) -> Optional[Dict[str, ParameterSuggestion]]:
         """Analyze recent performance and suggest parameter optimizations
         Uses Ollama AI if available, falls back to traditional methods"""
@@ -278,70 +490,49 @@ class AIAssistant:
                 return None
             
             # Try Ollama AI first if available
-            if self.use_ollama and self.ollama and self.ollama.is_available():
+            if await self._ollama_ready():
                 try:
                     # Calculate performance metrics
                     performance_metrics = self._calculate_performance_metrics(recent_trades)
                     
-                    # Use Ollama for intelligent analysis
-                    ollama_analysis = self.ollama.analyze_trading_performance(
-                        recent_trades, performance_metrics
+                    current_params = self._current_params()
+                    
+                    # One request covers both performance analysis and parameter
+                    # optimization instead of paying prompt overhead twice
+                    combined = await self.ollama.combined_analysis(
+                        self._summarize_trades(recent_trades), performance_metrics, current_params
                     )
+                    ollama_optimization = combined.get('optimization') if combined else None
                     
-                    if ollama_analysis:
-                        # Also get parameter optimization suggestions
-                        current_params = {
-                            'rsi_period': self.config['trading']['indicators']['rsi']['period'],
-                            'macd_fast': self.config['trading']['indicators']['macd']['fast_period'],
-                            'risk_per_trade': self.config['trading']['risk_per_trade'],
-                            'bollinger_std': self.config['trading']['indicators']['bollinger_bands']['std_dev'],
-                            'enable_rsi': self.config['trading']['indicators'].get('rsi', {}).get('enabled', True),
-                            'enable_macd': self.config['trading']['indicators'].get('macd', {}).get('enabled', True),
-                            'enable_bollinger_bands': self.config['trading']['indicators'].get('bollinger_bands', {}).get('enabled', True),
-                            'enable_ema': self.config['trading']['indicators'].get('ema', {}).get('enabled', True),
-                            'enable_vwap': self.config['trading']['indicators'].get('vwap', {}).get('enabled', True),
-                            'enable_stochastic': self.config['trading']['indicators'].get('stochastic', {}).get('enabled', False),
-                            'enable_williams_r': self.config['trading']['indicators'].get('williams_r', {}).get('enabled', False),
-                            'enable_cci': self.config['trading']['indicators'].get('cci', {}).get('enabled', False)
-                        }
-                        
-                        ollama_optimization = self.ollama.optimize_parameters(
-                            current_params, recent_trades
+                    if ollama_optimization and ollama_optimization.get('suggestions'):
+                        logger.info("Ollama AI provided optimization suggestions")
+                        # Parse Ollama suggestions and convert to ParameterSuggestion format
+                        suggestions = await self._parse_ollama_suggestions(
+                            ollama_optimization, current_params
                         )
-                        
-                        if ollama_optimization:
-                            logger.info("Ollama AI provided optimization suggestions")
-                            # Parse Ollama suggestions and convert to ParameterSuggestion format
-                            suggestions = await self._parse_ollama_suggestions(
-                                ollama_optimization, current_params
-                            )
-                            if suggestions:
-                                return suggestions
+                        if suggestions:
+                            return suggestions
                 except Exception as e:
                     logger.warning(f"Ollama analysis failed, using fallback: {e}")
             
             # Fallback to traditional analysis
             suggestions = {}
             
-            # RSI parameter optimization
-            rsi_suggestion = await self._optimize_rsi_parameters(recent_trades)
-            if rsi_suggestion:
-                suggestions['rsi_period'] = rsi_suggestion
-            
-            # MACD parameter optimization
-            macd_suggestion = await self._optimize_macd_parameters(recent_trades)
-            if macd_suggestion:
-                suggestions['macd_fast_period'] = macd_suggestion
-            
-            # Bollinger Bands optimization
-            bb_suggestion = await self._optimize_bollinger_parameters(recent_trades)
-            if bb_suggestion:
-                suggestions['bollinger_std_dev'] = bb_suggestion
-            
-            # Risk management optimization
-            risk_suggestion = await self._optimize_risk_parameters(recent_trades)
-            if risk_suggestion:
-                suggestions['risk_per_trade'] = risk_suggestion
+            # The optimizers are independent CPU-bound sweeps: run them on the
+            # default executor together instead of one after another on the loop
+            loop = asyncio.get_running_loop()
+            optimizers = (
+                ('rsi_period', self._optimize_rsi_parameters),
+                ('macd_fast_period', self._optimize_macd_parameters),
+                ('bollinger_std_dev', self._optimize_bollinger_parameters),
+                ('risk_per_trade', self._optimize_risk_parameters),
+            )
+            results = await asyncio.gather(*(
+                loop.run_in_executor(None, optimize, recent_trades) for _, optimize in optimizers
+            ))
+            for (parameter, _), suggestion in zip(optimizers, results):
+                if suggestion:
+                    suggestions[parameter] = suggestion
             
             return suggestions if suggestions else None
         
@@ -355,22 +546,9 @@ class AIAssistant:
             if not self.enabled or not research_summary:
                 return None
 
-            current_params = {
-                'rsi_period': self.config['trading']['indicators']['rsi']['period'],
-                'macd_fast': self.config['trading']['indicators']['macd']['fast_period'],
-                'risk_per_trade': self.config['trading']['risk_per_trade'],
-                'bollinger_std': self.config['trading']['indicators']['bollinger_bands']['std_dev'],
-                'enable_rsi': self.config['trading']['indicators'].get('rsi', {}).get('enabled', True),
-                'enable_macd': self.config['trading']['indicators'].get('macd', {}).get('enabled', True),
-                'enable_bollinger_bands': self.config['trading']['indicators'].get('bollinger_bands', {}).get('enabled', True),
-                'enable_ema': self.config['trading']['indicators'].get('ema', {}).get('enabled', True),
-                'enable_vwap': self.config['trading']['indicators'].get('vwap', {}).get('enabled', True),
-                'enable_stochastic': self.config['trading']['indicators'].get('stochastic', {}).get('enabled', False),
-                'enable_williams_r': self.config['trading']['indicators'].get('williams_r', {}).get('enabled', False),
-                'enable_cci': self.config['trading']['indicators'].get('cci', {}).get('enabled', False)
-            }
+            current_params = self._current_params()
 
-            if self.use_ollama and self.ollama and self.ollama.is_available():
+            if await self._ollama_ready():
                 prompt = (
                     "You are optimizing config parameters based on pattern research results.\n"
                     "Only suggest values for these parameters: rsi_period, macd_fast_period, "
@@ -382,7 +560,7 @@ class AIAssistant:
                     f"Current params: {current_params}\n"
                     f"Research summary: {research_summary}\n"
                 )
-                response = self.ollama.generate(prompt, temperature=0.2, max_tokens=300)
+                response = await self.ollama.generate(prompt, temperature=0.2, max_tokens=300)
                 if response:
                     parsed = await self._parse_ollama_suggestions({"suggestions": response}, current_params)
                     if parsed:
@@ -399,11 +577,14 @@ class AIAssistant:
         """Fallback suggestions based on simple research heuristics"""
         suggestions: Dict[str, ParameterSuggestion] = {}
 
-        total_occ = sum(item.get("occurrences", 0) for item in research_summary) or 1
-        weighted_success = sum(
-            item.get("success_rate", 0) * item.get("occurrences", 0) for item in research_summary
+        occurrences = np.fromiter(
+            (item.get("occurrences", 0) for item in research_summary), dtype=float, count=len(research_summary)
+        )
+        success_rates = np.fromiter(
+            (item.get("success_rate", 0) for item in research_summary), dtype=float, count=len(research_summary)
         )
-        avg_success = weighted_success / total_occ
+        total_occ = occurrences.sum() or 1
+        avg_success = float(np.dot(success_rates, occurrences) / total_occ)
 
         current_risk = float(current_params.get("risk_per_trade", 0.02))
         if avg_success < 0.45:
@@ -429,16 +610,11 @@ class AIAssistant:
                     expected_improvement=0.02
                 )
 
-        ranked = sorted(
-            research_summary,
-            key=lambda item: item.get("success_rate", 0),
-            reverse=True
-        )
-        top_patterns = [item.get("pattern_name") for item in ranked[:3]]
-        reversal_patterns = {"double_bottom", "double_top", "hammer", "engulfing", "doji"}
-        trend_patterns = {"higher_highs", "lower_lows"}
+        # Stable descending sort keeps ties in summary order, like sorted(reverse=True)
+        ranked = np.argsort(-success_rates, kind="stable")[:3]
+        top_patterns = [research_summary[i].get("pattern_name") for i in ranked]
 
-        if any(p in reversal_patterns for p in top_patterns):
+        if any(p in REVERSAL_PATTERNS for p in top_patterns):
             if not current_params.get("enable_stochastic", False):
                 suggestions["enable_stochastic"] = ParameterSuggestion(
                     parameter="enable_stochastic",
@@ -458,7 +634,7 @@ class AIAssistant:
                     expected_improvement=0.01
                 )
 
-        if any(p in trend_patterns for p in top_patterns):
+        if any(p in TREND_PATTERNS for p in top_patterns):
             if not current_params.get("enable_ema", False):
                 suggestions["enable_ema"] = ParameterSuggestion(
                     parameter="enable_ema",
@@ -488,35 +664,31 @@ class AIAssistant:
         if not self.trade_gating_enabled or not self.enabled:
             return {"approve": True, "confidence": 1.0, "reason": "AI gating disabled"}
 
-        # Use Ollama when available
-        if self.use_ollama and self.ollama and self.ollama.is_available():
+        # Use Ollama when available. Up to OLLAMA_NUM_PARALLEL evaluations run at
+        # once; when every slot is busy, skip the AI instead of queueing behind it
+        ollama_ready = await self._ollama_ready()
+        if ollama_ready and self._gate_sem.locked():
+            logger.warning("AI gate busy, using fallback gating")
+        elif ollama_ready:
             try:
-                async with self._gate_lock:
-                    prompt = (
-                        "Evaluate this trade signal and respond in JSON with keys "
-                        "`approve` (true/false), `confidence` (0-1), and `reason`.\n\n"
-                        f"Signal: action={signal.action}, confidence={signal.confidence:.2f}, "
-                        f"entry={signal.entry_price:.6f}, stop={signal.stop_loss:.6f}, "
-                        f"take_profit={signal.take_profit:.6f}\n"
-                        f"Indicators: rsi={indicators.get('rsi', pd.Series()).iloc[-1] if isinstance(indicators.get('rsi'), pd.Series) else indicators.get('rsi')}, "
-                        f"macd_hist={indicators.get('macd_histogram', pd.Series()).iloc[-1] if isinstance(indicators.get('macd_histogram'), pd.Series) else indicators.get('macd_histogram')}, "
-                        f"bb_width={indicators.get('bb_width', pd.Series()).iloc[-1] if isinstance(indicators.get('bb_width'), pd.Series) else indicators.get('bb_width')}, "
-                        f"ema_short={indicators.get('ema_short', pd.Series()).iloc[-1] if isinstance(indicators.get('ema_short'), pd.Series) else indicators.get('ema_short')}, "
-                        f"ema_long={indicators.get('ema_long', pd.Series()).iloc[-1] if isinstance(indicators.get('ema_long'), pd.Series) else indicators.get('ema_long')}"
-                    )
-                    response = self.ollama.generate(prompt, temperature=0.2, max_tokens=150)
+                fields = self._last_scalars(indicators, PROMPT_INDICATOR_KEYS)
+                fields.update(
+                    action=signal.action,
+                    confidence=signal.confidence,
+                    entry=signal.entry_price,
+                    stop=signal.stop_loss,
+                    take_profit=signal.take_profit
+                )
+                async with self._gate_sem:
+                    prompt = _GATE_PROMPT.format_map(fields)
+                    response = await self.ollama.generate(prompt, temperature=0.2, max_tokens=150)
                     if not response:
-                        short_prompt = (
-                            "Evaluate trade signal. Respond in JSON with keys approve, confidence, reason.\n"
-                            f"action={signal.action}, confidence={signal.confidence:.2f}, "
-                            f"entry={signal.entry_price:.6f}, stop={signal.stop_loss:.6f}, "
-                            f"take_profit={signal.take_profit:.6f}"
-                        )
-                        response = self.ollama.generate(short_prompt, temperature=0.2, max_tokens=64)
+                        short_prompt = _GATE_SHORT_PROMPT.format_map(fields)
+                        response = await self.ollama.generate(short_prompt, temperature=0.2, max_tokens=64)
                     if response:
                         response = response.strip()
                         if response.startswith("{"):
-                            data = json.loads(response)
+                            data = _loads(response)
                             approve = bool(data.get("approve", False))
                             confidence = float(data.get("confidence", 0))
                             reason = data.get("reason", "AI evaluation")
@@ -550,89 +722,79 @@ class AIAssistant:
     async def detect_patterns(self, df: pd.DataFrame, indicators: Dict, use_ai: bool = True) -> List[PatternMatch]:
         """Detect market patterns in current data
         Uses Ollama AI if available for enhanced pattern recognition"""
+        results = await self.detect_patterns_batch([("market", df, indicators)], use_ai=use_ai)
+        return results.get("market", [])
+
+    async def detect_patterns_batch(
+        self,
+        jobs: List[Tuple[str, pd.DataFrame, Dict]],
+        use_ai: bool = True
+    ) -> Dict[str, List[PatternMatch]]:
+        """Detect market patterns for several (symbol, df, indicators) jobs
+        All symbols share a single Ollama request; rule-based detectors run per symbol"""
         try:
-            if not self.enabled or df.empty:
-                return []
+            jobs = [job for job in jobs if job[1] is not None and not job[1].empty]
+            if not self.enabled or not jobs:
+                return {}
             
-            patterns = []
+            ai_patterns: Dict[str, List[Dict]] = {}
             
             # Try Ollama AI pattern detection first if available
-            if use_ai and self.use_ollama and self.ollama and self.ollama.is_available():
+            if use_ai and await self._ollama_ready():
                 try:
-                    # Prepare market data for Ollama
-                    market_data = {
-                        'current_price': float(df['close'].iloc[-1]),
-                        'high_24h': float(df['high'].max()),
-                        'low_24h': float(df['low'].min()),
-                        'volume_24h': float(df['volume'].sum())
-                    }
-                    
-                    # Prepare indicators for Ollama
-                    indicators_for_ollama = {}
-                    for key, value in indicators.items():
-                        if isinstance(value, pd.Series) and len(value) > 0:
-                            indicators_for_ollama[key] = {'value': float(value.iloc[-1])}
-                        elif isinstance(value, (int, float)):
-                            indicators_for_ollama[key] = value
-                    
-                    # Get AI pattern detection
-                    ollama_patterns = self.ollama.detect_market_patterns(
-                        market_data, indicators_for_ollama
-                    )
-                    
-                    if ollama_patterns:
-                        # Convert Ollama patterns to PatternMatch format
-                        for pattern_data in ollama_patterns:
-                            patterns.append(PatternMatch(
-                                pattern_name=pattern_data.get('pattern', 'AI Pattern'),
-                                confidence=pattern_data.get('confidence', 0.7),
-                                historical_success_rate=0.65,  # Default
-                                recommended_action=pattern_data.get('action', 'hold'),
-                                risk_level='medium'
-                            ))
-                        logger.debug(f"Ollama detected {len(patterns)} patterns")
+                    snapshots = [
+                        self._market_snapshot(symbol, df, indicators) for symbol, df, indicators in jobs
+                    ]
+                    ai_patterns = await self.ollama.detect_market_patterns_batch(snapshots) or {}
+                    logger.debug(f"Ollama detected patterns for {len(ai_patterns)}/{len(jobs)} symbols")
                 except Exception as e:
                     logger.warning(f"Ollama pattern detection failed, using fallback: {e}")
             
-            # Traditional pattern detection (always run as backup/confirmation)
-            # Detect bullish divergence
-            bullish_div = self._detect_bullish_divergence(df, indicators)
-            if bullish_div:
-                patterns.append(bullish_div)
-            
-            # Detect bearish divergence
-            bearish_div = self._detect_bearish_divergence(df, indicators)
-            if bearish_div:
-                patterns.append(bearish_div)
-            
-            # Detect Bollinger Band squeeze
-            bb_squeeze = self._detect_bollinger_squeeze(indicators)
-            if bb_squeeze:
-                patterns.append(bb_squeeze)
-            
-            # Detect MACD signals
-            macd_signal = self._detect_macd_patterns(indicators)
-            if macd_signal:
-                patterns.append(macd_signal)
-            
-            # Detect volume patterns
-            volume_pattern = self._detect_volume_patterns(df, indicators)
-            if volume_pattern:
-                patterns.append(volume_pattern)
-            
-            # Remove duplicates based on pattern name
-            seen = set()
-            unique_patterns = []
-            for pattern in patterns:
-                if pattern.pattern_name not in seen:
-                    seen.add(pattern.pattern_name)
-                    unique_patterns.append(pattern)
-            
-            return unique_patterns
+            results = {}
+            for symbol, df, indicators in jobs:
+                # Convert Ollama patterns to PatternMatch format
+                patterns = [
+                    PatternMatch(
+                        pattern_name=pattern_data.get('pattern', 'AI Pattern'),
+                        confidence=pattern_data.get('confidence', 0.7),
+                        historical_success_rate=0.65,  # Default
+                        recommended_action=pattern_data.get('action', 'hold'),
+                        risk_level='medium'
+                    )
+                    for pattern_data in ai_patterns.get(symbol, [])
+                ]
+                
+                # Traditional pattern detection (always run as backup/confirmation)
+                patterns.extend(self._detect_rule_patterns(df, indicators))
+                
+                # Remove duplicates based on pattern name
+                seen = set()
+                unique_patterns = []
+                for pattern in patterns:
+                    if pattern.pattern_name not in seen:
+                        seen.add(pattern.pattern_name)
+                        unique_patterns.append(pattern)
+                results[symbol] = unique_patterns
+            
+            return results
         
         except Exception as e:
             logger.error(f"Error detecting patterns: {e}")
-            return []
+            return {}
+
+    def _market_snapshot(self, symbol: str, df: pd.DataFrame, indicators: Dict) -> Dict[str, Any]:
+        """Latest price stats and key indicator values for one symbol's pattern prompt"""
+        snapshot = {
+            'symbol': symbol,
+            'current_price': float(df['close'].iloc[-1]),
+            'high': float(df['high'].max()),
+            'low': float(df['low'].min()),
+            'volume': float(df['volume'].sum())
+        }
+        for key, value in self._last_scalars(indicators, PATTERN_INDICATOR_KEYS).items():
+            if value is not None:
+                snapshot[key] = round(float(value), 6)
+        return snapshot
 
     def apply_research_summary(self, records: List[Dict]):
         """Update internal research stats from pattern research results"""
@@ -640,51 +802,74 @@ class AIAssistant:
             if not records:
                 return
 
+            idx, occ, succ = [], [], []
             for record in records:
-                key = f"{record.get('pattern_name')}:{record.get('timeframe')}"
+                name = record.get('pattern_name')
+                key = f"{name}:{record.get('timeframe')}"
                 self.research_stats.setdefault(key, []).append(record)
+                row = self._tmpl_idx.get(name)
+                if row is not None:
+                    idx.append(row)
+                    occ.append(record.get('occurrences', 0))
+                    succ.append(record.get('success_rate', 0))
 
-            # Update known template success rates if matching names exist
-            for template_name in self.pattern_templates.keys():
-                matching = [r for r in records if r.get('pattern_name') == template_name]
-                if not matching:
-                    continue
-                total_occ = sum(r.get('occurrences', 0) for r in matching) or 1
-                weighted_success = sum(r.get('success_rate', 0) * r.get('occurrences', 0) for r in matching)
-                self.pattern_templates[template_name]['success_rate'] = weighted_success / total_occ
+            # Update known template success rates (occurrence-weighted) if matching names exist
+            if idx:
+                size = len(self._tmpl_success)
+                occ = np.asarray(occ, dtype=float)
+                weighted = np.bincount(idx, weights=occ * np.asarray(succ, dtype=float), minlength=size)
+                total_occ = np.bincount(idx, weights=occ, minlength=size)
+                matched = np.bincount(idx, minlength=size) > 0
+                self._tmpl_success = np.where(
+                    matched, weighted / np.where(total_occ > 0, total_occ, 1), self._tmpl_success
+                )
+                for name, row in self._tmpl_idx.items():
+                    self.pattern_templates[name]['success_rate'] = float(self._tmpl_success[row])
+                self._cache_template_rates()
 
             logger.info("Applied research summary to AI assistant")
         except Exception as e:
             logger.error(f"Error applying research summary: {e}")
     
-    def _detect_bullish_divergence(self, df: pd.DataFrame, indicators: Dict) -> Optional[PatternMatch]:
-        """Detect bullish divergence pattern"""
+    def _detect_rule_patterns(self, df: pd.DataFrame, indicators: Dict) -> List[PatternMatch]:
+        """Run every rule-based detector on one symbol
+        Each column is pulled out of the DataFrame/indicator Series once and the
+        detectors work on the shared NumPy arrays."""
+        close = df['close'].values
+        rsi = self._indicator_values(indicators, 'rsi')
+        
+        matches = []
+        if len(close) >= 20 and len(rsi) >= 20:
+            prices, rsi_tail = close[-20:], rsi[-20:]
+            matches.append(self._detect_bullish_divergence(prices, rsi_tail))
+            matches.append(self._detect_bearish_divergence(prices, rsi_tail))
+        matches.append(self._detect_bollinger_squeeze(self._indicator_values(indicators, 'bb_width')))
+        matches.append(self._detect_macd_patterns(
+            self._indicator_values(indicators, 'macd_line'),
+            self._indicator_values(indicators, 'macd_signal'),
+            self._indicator_values(indicators, 'macd_histogram')
+        ))
+        matches.append(self._detect_volume_patterns(
+            close, df['volume'].values, self._indicator_values(indicators, 'volume_sma')
+        ))
+        return [match for match in matches if match]
+    
+    @staticmethod
+    def _indicator_values(indicators: Dict, key: str) -> np.ndarray:
+        """Raw array behind an indicator Series (empty when missing)"""
+        series = indicators.get(key)
+        return series.values if series is not None else _NO_VALUES
+    
+    def _detect_bullish_divergence(self, prices: np.ndarray, rsi_values: np.ndarray) -> Optional[PatternMatch]:
+        """Detect bullish divergence over the last 20 closes and RSI values"""
         try:
-            if len(df) < 20:
-                return None
-            
-            prices = df['close'].values[-20:]
-            rsi_values = indicators.get('rsi', pd.Series()).values[-20:]
-            
-            if len(rsi_values) < 20:
-                return None
-            
             # Find recent lows
-            price_lows = []
-            rsi_lows = []
+            low_idx = _pivot_indices(prices, lows=True)
             
-            for i in range(5, 15):
-                if (prices[i] < prices[i-1] and prices[i] < prices[i+1] and
-                    prices[i] < prices[i-2] and prices[i] < prices[i+2]):
-                    price_lows.append((i, prices[i]))
-                    rsi_lows.append((i, rsi_values[i]))
-            
-            if len(price_lows) >= 2:
+            if len(low_idx) >= 2:
                 # Check for divergence
-                latest_price_low = price_lows[-1][1]
-                previous_price_low = price_lows[-2][1]
-                latest_rsi_low = rsi_lows[-1][1]
-                previous_rsi_low = rsi_lows[-2][1]
+                previous_price_low, latest_price_low = prices[low_idx[-2:]]
+                previous_rsi_low, latest_rsi_low = rsi_values[low_idx[-2:]]
                 
                 if (latest_price_low < previous_price_low and 
                     latest_rsi_low > previous_rsi_low):
@@ -694,7 +879,7 @@ class AIAssistant:
                     return PatternMatch(
                         pattern_name='bullish_divergence',
                         confidence=confidence,
-                        historical_success_rate=self.pattern_templates['bullish_divergence']['success_rate'],
+                        historical_success_rate=self._success_bull,
                         recommended_action='buy',
                         risk_level='medium'
                     )
@@ -705,34 +890,16 @@ class AIAssistant:
             logger.error(f"Error detecting bullish divergence: {e}")
             return None
     
-    def _detect_bearish_divergence(self, df: pd.DataFrame, indicators: Dict) -> Optional[PatternMatch]:
-        """Detect bearish divergence pattern"""
+    def _detect_bearish_divergence(self, prices: np.ndarray, rsi_values: np.ndarray) -> Optional[PatternMatch]:
+        """Detect bearish divergence over the last 20 closes and RSI values"""
         try:
-            if len(df) < 20:
-                return None
-            
-            prices = df['close'].values[-20:]
-            rsi_values = indicators.get('rsi', pd.Series()).values[-20:]
-            
-            if len(rsi_values) < 20:
-                return None
-            
             # Find recent highs
-            price_highs = []
-            rsi_highs = []
+            high_idx = _pivot_indices(prices, lows=False)
             
-            for i in range(5, 15):
-                if (prices[i] > prices[i-1] and prices[i] > prices[i+1] and
-                    prices[i] > prices[i-2] and prices[i] > prices[i+2]):
-                    price_highs.append((i, prices[i]))
-                    rsi_highs.append((i, rsi_values[i]))
-            
-            if len(price_highs) >= 2:
+            if len(high_idx) >= 2:
                 # Check for divergence
-                latest_price_high = price_highs[-1][1]
-                previous_price_high = price_highs[-2][1]
-                latest_rsi_high = rsi_highs[-1][1]
-                previous_rsi_high = rsi_highs[-2][1]
+                previous_price_high, latest_price_high = prices[high_idx[-2:]]
+                previous_rsi_high, latest_rsi_high = rsi_values[high_idx[-2:]]
                 
                 if (latest_price_high > previous_price_high and 
                     latest_rsi_high < previous_rsi_high):
@@ -742,7 +909,7 @@ class AIAssistant:
                     return PatternMatch(
                         pattern_name='bearish_divergence',
                         confidence=confidence,
-                        historical_success_rate=self.pattern_templates['bearish_divergence']['success_rate'],
+                        historical_success_rate=self._success_bear,
                         recommended_action='sell',
                         risk_level='medium'
                     )
@@ -753,15 +920,17 @@ class AIAssistant:
             logger.error(f"Error detecting bearish divergence: {e}")
             return None
     
-    def _detect_bollinger_squeeze(self, indicators: Dict) -> Optional[PatternMatch]:
+    def _detect_bollinger_squeeze(self, bb_width: np.ndarray) -> Optional[PatternMatch]:
         """Detect Bollinger Band squeeze pattern"""
         try:
-            bb_width = indicators.get('bb_width', pd.Series())
             if len(bb_width) < 20:
                 return None
             
-            current_width = bb_width.iloc[-1]
-            avg_width = bb_width.rolling(20).mean().iloc[-1]
+            # Only the latest 20-bar mean is needed, so average the tail directly
+            # rather than building a full rolling Series
+            width_tail = np.asarray(bb_width[-20:], dtype=np.float64)
+            current_width = width_tail[-1]
+            avg_width = width_tail.mean()
             
             # Squeeze detected when current width is significantly below average
             if current_width < avg_width * 0.7:
@@ -770,7 +939,7 @@ class AIAssistant:
                 return PatternMatch(
                     pattern_name='bollinger_squeeze',
                     confidence=confidence,
-                    historical_success_rate=self.pattern_templates['bollinger_squeeze']['success_rate'],
+                    historical_success_rate=self._success_squeeze,
                     recommended_action='wait_for_breakout',
                     risk_level='high'
                 )
@@ -781,37 +950,36 @@ class AIAssistant:
             logger.error(f"Error detecting Bollinger squeeze: {e}")
             return None
     
-    def _detect_macd_patterns(self, indicators: Dict) -> Optional[PatternMatch]:
-        """Detect MACD pattern signals"""
+    def _detect_macd_patterns(self, ml: np.ndarray, ms: np.ndarray, mh: np.ndarray) -> Optional[PatternMatch]:
+        """Detect MACD pattern signals from the line, signal and histogram arrays"""
         try:
-            macd_line = indicators.get('macd_line', pd.Series())
-            macd_signal = indicators.get('macd_signal', pd.Series())
-            macd_histogram = indicators.get('macd_histogram', pd.Series())
-            
-            if len(macd_histogram) < 3:
+            if len(mh) < 3:
                 return None
             
+            # Both crosses scale confidence by the latest histogram bar
+            last_h = mh[-1]
+            
             # Golden cross detection
-            if (macd_line.iloc[-1] > macd_signal.iloc[-1] and 
-                macd_line.iloc[-2] <= macd_signal.iloc[-2] and
-                macd_histogram.iloc[-1] > 0):
+            if (ml[-1] > ms[-1] and 
+                ml[-2] <= ms[-2] and
+                last_h > 0):
                 
-                confidence = min(0.8, abs(macd_histogram.iloc[-1]) * 10)
+                confidence = min(0.8, abs(last_h) * 10.0)
                 
                 return PatternMatch(
                     pattern_name='macd_golden_cross',
                     confidence=confidence,
-                    historical_success_rate=self.pattern_templates['macd_golden_cross']['success_rate'],
+                    historical_success_rate=self._success_macd,
                     recommended_action='buy',
                     risk_level='low'
                 )
             
             # Death cross detection
-            elif (macd_line.iloc[-1] < macd_signal.iloc[-1] and 
-                  macd_line.iloc[-2] >= macd_signal.iloc[-2] and
-                  macd_histogram.iloc[-1] < 0):
+            elif (ml[-1] < ms[-1] and 
+                  ml[-2] >= ms[-2] and
+                  last_h < 0):
                 
-                confidence = min(0.8, abs(macd_histogram.iloc[-1]) * 10)
+                confidence = min(0.8, abs(last_h) * 10.0)
                 
                 return PatternMatch(
                     pattern_name='macd_death_cross',
@@ -827,25 +995,24 @@ class AIAssistant:
             logger.error(f"Error detecting MACD patterns: {e}")
             return None
     
-    def _detect_volume_patterns(self, df: pd.DataFrame, indicators: Dict) -> Optional[PatternMatch]:
+    def _detect_volume_patterns(self, closes: np.ndarray, volume: np.ndarray,
+                                volume_sma: np.ndarray) -> Optional[PatternMatch]:
         """Detect volume-based patterns"""
         try:
-            if len(df) < 10:
+            if len(closes) < 10:
                 return None
             
-            volume = df['volume'].values[-10:]
-            volume_sma = indicators.get('volume_sma', pd.Series())
-            
             if len(volume_sma) < 1:
                 return None
             
             current_volume = volume[-1]
-            avg_volume = volume_sma.iloc[-1]
+            avg_volume = volume_sma[-1]
             
             # Volume spike detection
             if current_volume > avg_volume * 2:
                 # Check price movement direction
-                price_change = (df['close'].iloc[-1] - df['close'].iloc[-2]) / df['close'].iloc[-2]
+                c_last, c_prev = closes[-1], closes[-2]
+                price_change = (c_last - c_prev) / c_prev
                 
                 confidence = min(0.9, (current_volume / avg_volume - 1) / 2)
                 action = 'buy' if price_change > 0 else 'sell'
@@ -853,7 +1020,7 @@ class AIAssistant:
                 return PatternMatch(
                     pattern_name='volume_spike',
                     confidence=confidence,
-                    historical_success_rate=self.pattern_templates['volume_spike']['success_rate'],
+                    historical_success_rate=self._success_volume,
                     recommended_action=action,
                     risk_level='medium'
                 )
@@ -874,26 +1041,33 @@ class AIAssistant:
             logger.error(f"Error getting recent trades: {e}")
             return []
     
-    async def _optimize_rsi_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
+    @staticmethod
+    def _sweep_parameter(simulate, trades: List[Dict], candidates: List, current):
+        """Score every candidate value and return (best value, best score)
+        
+        The current value is kept unless some candidate scores above zero; ties
+        go to the earliest candidate.
+        """
+        scores = np.fromiter((simulate(trades, value) for value in candidates),
+                             dtype=np.float64, count=len(candidates))
+        best = int(np.argmax(scores))
+        if scores[best] > 0:
+            return candidates[best], float(scores[best])
+        return current, 0
+    
+    def _optimize_rsi_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
         """Optimize RSI parameters based on recent performance"""
         try:
-            if len(trades) < 20:
+            if self._sim_is_stub or len(trades) < 20:
                 return None
             
             current_period = self.config['trading']['indicators']['rsi']['period']
             
             # Simulate different RSI periods
             periods_to_test = [3, 5, 7, 9, 12]
-            best_period = current_period
-            best_performance = 0
-            
-            for period in periods_to_test:
-                # Calculate hypothetical performance with this period
-                # This is a simplified simulation
-                performance = self._simulate_rsi_performance(trades, period)
-                if performance > best_performance:
-                    best_performance = performance
-                    best_period = period
+            best_period, best_performance = self._sweep_parameter(
+                self._simulate_rsi_performance, trades, periods_to_test, current_period
+            )
             
             if best_period != current_period and best_performance > 0.1:
                 return ParameterSuggestion(
@@ -916,27 +1090,25 @@ class AIAssistant:
         try:
             # Simplified simulation - would need actual backtesting
             # Return random performance for demonstration
-            return np.random.uniform(0, 0.3)
+            return self._rsi_rng.uniform(0.0, 0.3)
         except Exception as e:
             logger.error(f"Error simulating RSI performance: {e}")
             return 0.0
     
-    async def _optimize_macd_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
+    def _optimize_macd_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
         """Optimize MACD parameters"""
         try:
+            if self._sim_is_stub:
+                return None
+            
             # Similar to RSI optimization but for MACD
             current_fast = self.config['trading']['indicators']['macd']['fast_period']
             
             # Test different fast periods
             fast_periods = [5, 6, 8, 10, 12]
-            best_fast = current_fast
-            best_performance = 0
-            
-            for fast in fast_periods:
-                performance = self._simulate_macd_performance(trades, fast)
-                if performance > best_performance:
-                    best_performance = performance
-                    best_fast = fast
+            best_fast, best_performance = self._sweep_parameter(
+                self._simulate_macd_performance, trades, fast_periods, current_fast
+            )
             
             if best_fast != current_fast and best_performance > 0.1:
                 return ParameterSuggestion(
@@ -957,25 +1129,23 @@ class AIAssistant:
     def _simulate_macd_performance(self, trades: List[Dict], fast_period: int) -> float:
         """Simulate MACD performance"""
         try:
-            return np.random.uniform(0, 0.25)
+            return self._macd_rng.uniform(0.0, 0.25)
         except Exception as e:
             return 0.0
     
-    async def _optimize_bollinger_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
+    def _optimize_bollinger_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
         """Optimize Bollinger Bands parameters"""
         try:
+            if self._sim_is_stub:
+                return None
+            
             current_std = self.config['trading']['indicators']['bollinger_bands']['std_dev']
             
             # Test different standard deviations
             std_devs = [1.2, 1.5, 1.8, 2.0, 2.2]
-            best_std = current_std
-            best_performance = 0
-            
-            for std in std_devs:
-                performance = self._simulate_bb_performance(trades, std)
-                if performance > best_performance:
-                    best_performance = performance
-                    best_std = std
+            best_std, best_performance = self._sweep_parameter(
+                self._simulate_bb_performance, trades, std_devs, current_std
+            )
             
             if best_std != current_std and best_performance > 0.1:
                 return ParameterSuggestion(
@@ -996,11 +1166,11 @@ class AIAssistant:
     def _simulate_bb_performance(self, trades: List[Dict], std_dev: float) -> float:
         """Simulate Bollinger Bands performance"""
         try:
-            return np.random.uniform(0, 0.2)
+            return self._bollinger_rng.uniform(0.0, 0.2)
         except Exception as e:
             return 0.0
     
-    async def _optimize_risk_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
+    def _optimize_risk_parameters(self, trades: List[Dict]) -> Optional[ParameterSuggestion]:
         """Optimize risk management parameters"""
         try:
             current_risk = self.config['trading']['risk_per_trade']
@@ -1009,9 +1179,8 @@ class AIAssistant:
             if not trades:
                 return None
             
-            # Calculate win rate and average returns
-            wins = sum(1 for trade in trades if trade.get('pnl', 0) > 0)
-            win_rate = wins / len(trades)
+            # Calculate win rate (shares the cached metrics reduction)
+            win_rate = self._calculate_performance_metrics(trades).get('win_rate', 0)
             
             # Suggest risk adjustment based on performance
             if win_rate > 0.6:
@@ -1047,9 +1216,9 @@ class AIAssistant:
             if not self.enabled:
                 return
             
-            # Store trade data for learning
+            # Store trade data for learning (the timestamp lives in the
+            # columnar store and is only turned into a datetime when saved)
             self.trade_history.append({
-                'timestamp': datetime.now(),
                 'symbol': trade_data.get('symbol'),
                 'action': trade_data.get('action'),
                 'entry_price': trade_data.get('entry_price'),
@@ -1058,40 +1227,68 @@ class AIAssistant:
                 'indicators': trade_data.get('indicators', {}),
                 'patterns': trade_data.get('patterns', [])
             })
+            self._push_trade_columns(trade_data.get('pnl') or 0, time.time_ns())
             
             # Update pattern success rates
             self._update_pattern_success_rates(trade_data)
-            
-            # Limit history size
-            if len(self.trade_history) > 1000:
-                self.trade_history = self.trade_history[-1000:]
         
         except Exception as e:
             logger.error(f"Error learning from trade: {e}")
     
+    def _push_trade_columns(self, pnl: float, ts_ns: int):
+        """Append one trade to the columnar history"""
+        if self._n_trades == len(self._pnl_arr):
+            # Slab full: keep the newest rows and restart from the front
+            keep = TRADE_HISTORY_LIMIT - 1
+            tail = slice(self._n_trades - keep, self._n_trades)
+            self._pnl_arr[:keep] = self._pnl_arr[tail]
+            self._ts_arr[:keep] = self._ts_arr[tail]
+            self._n_trades = keep
+        self._pnl_arr[self._n_trades] = pnl
+        self._ts_arr[self._n_trades] = ts_ns
+        self._n_trades += 1
+    
+    def _load_trade_columns(self, history):
+        """Rebuild the columnar history from trade records"""
+        history = list(history)[-TRADE_HISTORY_LIMIT:]
+        self._n_trades = len(history)
+        self._pnl_arr[:self._n_trades] = np.fromiter(
+            (t.get('pnl') or 0 for t in history), dtype=np.float64, count=self._n_trades
+        )
+        self._ts_arr[:self._n_trades] = np.fromiter(
+            (int(t['timestamp'].timestamp() * 1e9) if isinstance(t.get('timestamp'), datetime) else 0
+             for t in history),
+            dtype=np.int64, count=self._n_trades
+        )
+    
+    def _history_span(self) -> slice:
+        """Slab rows holding the learned trades, oldest first"""
+        return slice(max(0, self._n_trades - TRADE_HISTORY_LIMIT), self._n_trades)
+    
+    def _history_pnls(self) -> np.ndarray:
+        """View of the learned trade P&Ls, oldest first"""
+        return self._pnl_arr[self._history_span()]
+    
     def _update_pattern_success_rates(self, trade_data: Dict):
         """Update pattern success rates based on trade outcome"""
         try:
             patterns = trade_data.get('patterns', [])
             pnl = trade_data.get('pnl', 0)
             
+            won = int(pnl > 0)
+            
+            # Only counts are kept; get_pattern_confidence derives the rate on demand
             for pattern in patterns:
                 pattern_name = pattern.get('pattern_name')
-                if pattern_name not in self.market_patterns:
-                    self.market_patterns[pattern_name] = {
+                stats = self.market_patterns.get(pattern_name)
+                if stats is None:
+                    stats = self.market_patterns[pattern_name] = {
                         'total_trades': 0,
-                        'successful_trades': 0,
-                        'success_rate': 0.5
+                        'successful_trades': 0
                     }
                 
-                self.market_patterns[pattern_name]['total_trades'] += 1
-                if pnl > 0:
-                    self.market_patterns[pattern_name]['successful_trades'] += 1
-                
-                # Update success rate
-                total = self.market_patterns[pattern_name]['total_trades']
-                successful = self.market_patterns[pattern_name]['successful_trades']
-                self.market_patterns[pattern_name]['success_rate'] = successful / total
+                stats['total_trades'] += 1
+                stats['successful_trades'] += won
         
         except Exception as e:
             logger.error(f"Error updating pattern success rates: {e}")
@@ -1102,7 +1299,7 @@ class AIAssistant:
             if pattern_name in self.market_patterns:
                 pattern_data = self.market_patterns[pattern_name]
                 if pattern_data['total_trades'] >= 10:
-                    return pattern_data['success_rate']
+                    return pattern_data['successful_trades'] / pattern_data['total_trades']
             
             # Return default from template
             return self.pattern_templates.get(pattern_name, {}).get('success_rate', 0.5)
@@ -1114,14 +1311,19 @@ class AIAssistant:
     def save_learning_data(self, filepath: str):
         """Save learning data to file"""
         try:
+            timestamps = self._ts_arr[self._history_span()].tolist()
             data = {
-                'trade_history': self.trade_history,
+                'trade_history': [
+                    dict(record, timestamp=datetime.fromtimestamp(ts_ns / 1e9))
+                    for record, ts_ns in zip(self.trade_history, timestamps[-len(self.trade_history):])
+                ],
                 'market_patterns': self.market_patterns,
                 'parameter_performance': self.parameter_performance
             }
             
-            with open(filepath, 'wb') as f:
-                pickle.dump(data, f)
+            # Fast compression: the history is mostly repeated keys and small numbers
+            with gzip.open(filepath, 'wb', compresslevel=1) as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
             
             logger.info(f"Learning data saved to {filepath}")
         
@@ -1132,9 +1334,17 @@ class AIAssistant:
         """Load learning data from file"""
         try:
             with open(filepath, 'rb') as f:
-                data = pickle.load(f)
+                # Files written before compression was added are plain pickles
+                gzipped = f.read(2) == b'\x1f\x8b'
+                f.seek(0)
+                if gzipped:
+                    with gzip.GzipFile(fileobj=f) as zf:
+                        data = pickle.load(zf)
+                else:
+                    data = pickle.load(f)
             
-            self.trade_history = data.get('trade_history', [])
+            self.trade_history = deque(data.get('trade_history', []), maxlen=TRADE_HISTORY_LIMIT)
+            self._load_trade_columns(self.trade_history)
             self.market_patterns = data.get('market_patterns', {})
             self.parameter_performance = data.get('parameter_performance', {})
             
@@ -1143,150 +1353,114 @@ class AIAssistant:
         except Exception as e:
             logger.error(f"Error loading learning data: {e}")
     
-    def _calculate_performance_metrics(self, trades: List[Dict]) -> Dict:
-        """Calculate performance metrics from trade data"""
+    def _calculate_performance_metrics(self, trades: Optional[List[Dict]] = None) -> Dict:
+        """Calculate performance metrics from trade data (default: the learned history)"""
         try:
+            if trades is None:
+                return _pnl_metrics(self._history_pnls())
             if not trades:
                 return {}
             
-            total_trades = len(trades)
-            winning_trades = sum(1 for t in trades if t.get('pnl', 0) > 0)
-            losing_trades = total_trades - winning_trades
-            
-            gross_profit = sum(t.get('pnl', 0) for t in trades if t.get('pnl', 0) > 0)
-            gross_loss = abs(sum(t.get('pnl', 0) for t in trades if t.get('pnl', 0) < 0))
-            
-            win_rate = winning_trades / total_trades if total_trades > 0 else 0
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-            
-            net_pnl = sum(t.get('pnl', 0) for t in trades)
-            
-            # Calculate max drawdown
-            cumulative_pnl = []
-            running_total = 0
-            for trade in trades:
-                running_total += trade.get('pnl', 0)
-                cumulative_pnl.append(running_total)
-            
-            if cumulative_pnl:
-                peak = cumulative_pnl[0]
-                max_drawdown = 0
-                for value in cumulative_pnl:
-                    if value > peak:
-                        peak = value
-                    drawdown = peak - value
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
-            else:
-                max_drawdown = 0
-            
-            return {
-                'win_rate': win_rate,
-                'total_trades': total_trades,
-                'net_pnl': net_pnl,
-                'profit_factor': profit_factor,
-                'max_drawdown': max_drawdown,
-                'gross_profit': gross_profit,
-                'gross_loss': gross_loss
-            }
+            # Metrics depend only on the P&L sequence, so repeated analyses of an
+            # unchanged trade history are served from the cache
+            return dict(_performance_metrics(tuple(t.get('pnl', 0) for t in trades)))
         except Exception as e:
             logger.error(f"Error calculating performance metrics: {e}")
             return {}
     
+    def _summarize_trades(self, trades: List[Dict], k: int = 20) -> Dict:
+        """Fixed-size trade summary for LLM prompts, whatever the history length"""
+        pnl = np.fromiter((t.get('pnl', 0) for t in trades), dtype=float, count=len(trades))
+        return {
+            'n': len(trades),
+            'avg_pnl': round(float(pnl.mean()), 4) if len(pnl) else 0.0,
+            'std_pnl': round(float(pnl.std()), 4) if len(pnl) else 0.0,
+            'recent': [
+                (t.get('side') or t.get('action'), round(float(t.get('pnl', 0)), 4))
+                for t in trades[-k:]
+            ]
+        }
+    
     async def _parse_ollama_suggestions(self, ollama_optimization: Dict, 
                                        current_params: Dict) -> Dict[str, ParameterSuggestion]:
         """Parse Ollama optimization suggestions into ParameterSuggestion format"""
         try:
             suggestions = {}
             suggestions_text = ollama_optimization.get('suggestions', '')
+            lower_text = suggestions_text.lower()
             
             # Parse text suggestions (simple pattern matching)
             # In production, use more sophisticated parsing or structured output
             
             # Look for RSI suggestions
-            if 'rsi' in suggestions_text.lower():
-                # Try to extract suggested value
-                import re
-                rsi_match = re.search(r'rsi.*?(\d+)', suggestions_text.lower())
-                if rsi_match:
-                    suggested_rsi = int(rsi_match.group(1))
-                    current_rsi = current_params.get('rsi_period', 14)
-                    if suggested_rsi != current_rsi:
-                        suggestions['rsi_period'] = ParameterSuggestion(
-                            parameter='rsi_period',
-                            current_value=current_rsi,
-                            suggested_value=suggested_rsi,
-                            confidence=0.75,
-                            reason="Ollama AI optimization suggestion",
-                            expected_improvement=0.05
-                        )
+            rsi_match = _RSI_VALUE_RE.search(lower_text)
+            if rsi_match:
+                suggested_rsi = int(rsi_match.group(1))
+                current_rsi = current_params.get('rsi_period', 14)
+                if suggested_rsi != current_rsi:
+                    suggestions['rsi_period'] = ParameterSuggestion(
+                        parameter='rsi_period',
+                        current_value=current_rsi,
+                        suggested_value=suggested_rsi,
+                        confidence=0.75,
+                        reason="Ollama AI optimization suggestion",
+                        expected_improvement=0.05
+                    )
             
             # Look for MACD suggestions
-            if 'macd' in suggestions_text.lower():
-                macd_match = re.search(r'macd.*?(\d+)', suggestions_text.lower())
-                if macd_match:
-                    suggested_macd = int(macd_match.group(1))
-                    current_macd = current_params.get('macd_fast', 12)
-                    if suggested_macd != current_macd:
-                        suggestions['macd_fast_period'] = ParameterSuggestion(
-                            parameter='macd_fast_period',
-                            current_value=current_macd,
-                            suggested_value=suggested_macd,
-                            confidence=0.75,
-                            reason="Ollama AI optimization suggestion",
-                            expected_improvement=0.05
-                        )
+            macd_match = _MACD_VALUE_RE.search(lower_text)
+            if macd_match:
+                suggested_macd = int(macd_match.group(1))
+                current_macd = current_params.get('macd_fast', 12)
+                if suggested_macd != current_macd:
+                    suggestions['macd_fast_period'] = ParameterSuggestion(
+                        parameter='macd_fast_period',
+                        current_value=current_macd,
+                        suggested_value=suggested_macd,
+                        confidence=0.75,
+                        reason="Ollama AI optimization suggestion",
+                        expected_improvement=0.05
+                    )
             
             # Look for risk suggestions
-            if 'risk' in suggestions_text.lower():
-                risk_match = re.search(r'risk.*?([\d.]+)', suggestions_text.lower())
-                if risk_match:
-                    suggested_risk = float(risk_match.group(1))
-                    current_risk = current_params.get('risk_per_trade', 0.02)
-                    if abs(suggested_risk - current_risk) > 0.001:
-                        suggestions['risk_per_trade'] = ParameterSuggestion(
-                            parameter='risk_per_trade',
-                            current_value=current_risk,
-                            suggested_value=suggested_risk,
-                            confidence=0.75,
-                            reason="Ollama AI optimization suggestion",
-                            expected_improvement=0.05
-                        )
+            risk_match = _RISK_VALUE_RE.search(lower_text)
+            if risk_match:
+                suggested_risk = float(risk_match.group(1))
+                current_risk = current_params.get('risk_per_trade', 0.02)
+                if abs(suggested_risk - current_risk) > 0.001:
+                    suggestions['risk_per_trade'] = ParameterSuggestion(
+                        parameter='risk_per_trade',
+                        current_value=current_risk,
+                        suggested_value=suggested_risk,
+                        confidence=0.75,
+                        reason="Ollama AI optimization suggestion",
+                        expected_improvement=0.05
+                    )
 
-            # Indicator enable/disable suggestions
-            indicator_map = {
-                "stochastic": "enable_stochastic",
-                "williams": "enable_williams_r",
-                "cci": "enable_cci",
-                "rsi": "enable_rsi",
-                "macd": "enable_macd",
-                "bollinger": "enable_bollinger_bands",
-                "ema": "enable_ema",
-                "vwap": "enable_vwap"
-            }
-            lower_text = suggestions_text.lower()
-            for key, param_name in indicator_map.items():
-                if key in lower_text:
-                    current_value = self.config.get('trading', {}).get('indicators', {}).get(
-                        param_name.replace("enable_", ""),
-                        {}
-                    ).get('enabled', True if param_name in ["enable_rsi", "enable_macd", "enable_bollinger_bands", "enable_ema", "enable_vwap"] else False)
-                    if "disable" in lower_text or "turn off" in lower_text:
-                        suggestions[param_name] = ParameterSuggestion(
-                            parameter=param_name,
-                            current_value=current_value,
-                            suggested_value=False,
-                            confidence=0.7,
-                            reason="Ollama AI suggests disabling indicator",
-                            expected_improvement=0.03
+            # Indicator enable/disable suggestions. The direction only depends on
+            # the text, so decide it once rather than per indicator.
+            if "disable" in lower_text or "turn off" in lower_text:
+                toggle, toggle_reason = False, "Ollama AI suggests disabling indicator"
+            elif "enable" in lower_text or "turn on" in lower_text or "include" in lower_text:
+                toggle, toggle_reason = True, "Ollama AI suggests enabling indicator"
+            else:
+                toggle = None
+            
+            if toggle is not None:
+                indicators_cfg = self.config.get('trading', {}).get('indicators', {})
+                mentioned = set(_INDICATOR_KEYWORD_RE.findall(lower_text))
+                for key, param_name in INDICATOR_TOGGLES.items():
+                    if key in mentioned:
+                        indicator = param_name.replace("enable_", "")
+                        current_value = indicators_cfg.get(indicator, {}).get(
+                            'enabled', indicator in DEFAULT_ON_INDICATORS
                         )
-                    elif "enable" in lower_text or "turn on" in lower_text or "include" in lower_text:
                         suggestions[param_name] = ParameterSuggestion(
                             parameter=param_name,
                             current_value=current_value,
-                            suggested_value=True,
+                            suggested_value=toggle,
                             confidence=0.7,
-                            reason="Ollama AI suggests enabling indicator",
+                            reason=toggle_reason,
                             expected_improvement=0.03
                         )
             
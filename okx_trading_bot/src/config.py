@@ -0,0 +1,173 @@
+"""
+Configuration Loading Module
+Parses config.yml with a sidecar cache and exposes typed, immutable config views
+"""
+
+import copy
+import functools
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import yaml
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C loader is much faster than the pure-Python SafeLoader
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+CACHE_SUFFIX = ".json"
+
+# (config section, environment variable, config key) for secrets kept out of config.yml
+ENV_OVERRIDES = (
+    ('okx', 'OKX_API_KEY', 'api_key'),
+    ('okx', 'OKX_SECRET_KEY', 'secret_key'),
+    ('okx', 'OKX_PASSPHRASE', 'passphrase'),
+    ('discord', 'DISCORD_BOT_TOKEN', 'bot_token'),
+    ('discord', 'DISCORD_CHANNEL_ID', 'channel_id'),
+    ('discord', 'DISCORD_WEBHOOK_URL', 'webhook_url'),
+)
+
+
+def load_yaml_config(config_path: str, config_mtime: Optional[int] = None) -> Dict:
+    """Load a YAML config file; the result is a private copy safe to mutate
+
+    Callers that already stat()ed the file can pass its st_mtime_ns to skip
+    a second stat.
+    """
+    if config_mtime is None:
+        config_mtime = os.stat(config_path).st_mtime_ns
+    return copy.deepcopy(_parse_config_cached(config_path, config_mtime))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_cached(config_path: str, config_mtime: int) -> Dict:
+    """Parse a config once per (path, mtime), preferring a fresh JSON sidecar"""
+    cache_path = config_path + CACHE_SUFFIX
+
+    try:
+        with open(cache_path, 'rb') as handle:
+            cached = _json_loads(handle.read())
+        if cached.get('mtime_ns') == config_mtime:
+            return cached['config']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    with open(config_path, 'r') as file:
+        config = yaml.load(file, Loader=SafeLoader)
+
+    # Write-then-rename so a crash never leaves a torn sidecar behind
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as handle:
+            handle.write(_json_dumps({'mtime_ns': config_mtime, 'config': config}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Config cache not written: {e}")
+
+    return config
+
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(value) -> bytes:
+    return orjson.dumps(value) if orjson else json.dumps(value).encode('utf-8')
+
+
+def apply_env_overrides(config: Dict):
+    """Overlay credentials from the environment onto the config in place"""
+    env = os.environ
+    for section, env_key, cfg_key in ENV_OVERRIDES:
+        section_config = config.get(section)
+        if section_config is not None:
+            section_config[cfg_key] = env.get(env_key) or section_config.get(cfg_key, '')
+
+
+# Frozen, slotted views of the settings the bot manager reads. Explicit
+# __slots__ keeps Python 3.8 support (dataclass(slots=True) needs 3.10).
+# The engine keeps the raw dict because approved suggestions mutate it.
+
+@dataclass(frozen=True)
+class TradingCfg:
+    """Trading section of the bot configuration"""
+    __slots__ = ('initial_capital', 'risk_per_trade', 'max_risk_amount',
+                 'max_active_pairs', 'base_currency', 'timeframe')
+    initial_capital: float
+    risk_per_trade: float
+    max_risk_amount: float
+    max_active_pairs: int
+    base_currency: str
+    timeframe: str
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "TradingCfg":
+        return cls(
+            initial_capital=raw['initial_capital'],
+            risk_per_trade=raw['risk_per_trade'],
+            max_risk_amount=raw['max_risk_amount'],
+            max_active_pairs=raw['max_active_pairs'],
+            base_currency=raw.get('base_currency', 'USDT'),
+            timeframe=raw['strategy']['timeframe']
+        )
+
+
+@dataclass(frozen=True)
+class OkxCfg:
+    """OKX section of the bot configuration"""
+    __slots__ = ('sandbox',)
+    sandbox: bool
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "OkxCfg":
+        return cls(sandbox=raw['sandbox'])
+
+
+@dataclass(frozen=True)
+class DiscordCfg:
+    """Discord section of the bot configuration"""
+    __slots__ = ('enabled',)
+    enabled: bool
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "DiscordCfg":
+        return cls(enabled=bool(raw.get('bot_token')))
+
+
+@dataclass(frozen=True)
+class AiCfg:
+    """AI assistant section of the bot configuration"""
+    __slots__ = ('enabled',)
+    enabled: bool
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "AiCfg":
+        return cls(enabled=bool(raw['enabled']))
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    """Typed, immutable bot configuration"""
+    __slots__ = ('trading', 'okx', 'discord', 'ai_assistant')
+    trading: TradingCfg
+    okx: OkxCfg
+    discord: DiscordCfg
+    ai_assistant: AiCfg
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "BotConfig":
+        return cls(
+            trading=TradingCfg.from_dict(raw['trading']),
+            okx=OkxCfg.from_dict(raw['okx']),
+            discord=DiscordCfg.from_dict(raw.get('discord') or {}),
+            ai_assistant=AiCfg.from_dict(raw['ai_assistant'])
+        )
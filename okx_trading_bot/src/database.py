@@ -13,8 +13,106 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 import os
+import time
+import asyncio
+import math
+from contextlib import asynccontextmanager
 from dataclasses import asdict
+from decimal import Decimal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Applied once to the shared connection: WAL lets readers run alongside the
+# writer and, with synchronous=NORMAL, commits no longer fsync twice
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',      # 64 MB page cache
+    'PRAGMA mmap_size=268435456',    # 256 MB memory-mapped reads
+    'PRAGMA wal_autocheckpoint=1000',
+)
+
+# Pragmas above that are per attached database rather than per connection;
+# they are repeated for the market data file
+PER_DATABASE_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size')
+
+# Applied to the query connection, which never writes
+READER_PRAGMAS = (
+    'PRAGMA query_only=ON',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA mmap_size=268435456',
+)
+
+# Bumped whenever _migrate() gains a step (stored in PRAGMA user_version)
+SCHEMA_VERSION = 6
+
+# Cached candle prices are stored as integers scaled by their series'
+# price_scale, a power of ten fixed when the series is created: enough
+# decimals for the market tick (or PRICE_SIGNIFICANT_DIGITS of the smallest
+# price when the tick is unknown), never below DEFAULT_PRICE_SCALE, and
+# capped so PRICE_HEADROOM times the largest price still fits in int64
+DEFAULT_PRICE_SCALE = 100_000_000
+PRICE_SIGNIFICANT_DIGITS = 10
+PRICE_HEADROOM = 100
+
+# Prepared statements kept per connection. Inline SQL literals are the same
+# string on every call, so they hit this cache; the headroom over the default
+# (100 on older Pythons) keeps hot inserts from being evicted by the dynamic
+# get_trades filter combinations and per-table maintenance statements
+STATEMENT_CACHE_SIZE = 256
+
+# Balance samples are buffered and written together every interval (seconds),
+# or as soon as this many are waiting
+BALANCE_FLUSH_INTERVAL = 5.0
+BALANCE_BUFFER_LIMIT = 100
+# Cap on samples kept for retry while writes keep failing
+BALANCE_BUFFER_MAX = 10 * BALANCE_BUFFER_LIMIT
+
+# Rows removed per transaction by cleanup_old_data
+CLEANUP_BATCH_SIZE = 5000
+
+# Tables whose timestamp column holds epoch milliseconds
+TIMESTAMP_TABLES = (
+    'trades', 'balance_history', 'ai_learning', 'system_logs', 'config_history', 'pattern_research'
+)
+
+
+def _epoch_ms(moment: datetime) -> int:
+    """Epoch milliseconds for a (naive local) datetime"""
+    return int(moment.timestamp() * 1000)
+
+
+def _now_ms() -> int:
+    """Current time in epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+
+def _json_dumps(value) -> str:
+    """Serialize a JSON column (orjson when installed; it also handles numpy values)"""
+    if orjson:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+
+def _price_scale(prices: np.ndarray, tick_size: Optional[float] = None) -> int:
+    """Power-of-ten price scale for a new market series (see DEFAULT_PRICE_SCALE)"""
+    if tick_size:
+        decimals = max(0, -Decimal(repr(float(tick_size))).normalize().as_tuple().exponent)
+    else:
+        positive = prices[prices > 0]
+        low = float(positive.min()) if positive.size else 1.0
+        decimals = PRICE_SIGNIFICANT_DIGITS - 1 - math.floor(math.log10(low))
+    scale = max(DEFAULT_PRICE_SCALE, 10 ** decimals)
+    high = float(prices.max()) if prices.size else 0.0
+    while scale > 1 and high * PRICE_HEADROOM * scale >= 2 ** 63:
+        scale //= 10
+    return scale
 
 class DatabaseManager:
     """SQLite database manager for trading bot data"""
@@ -24,6 +122,29 @@ class DatabaseManager:
         self.config = config
         self.db_path = config.get('database', {}).get('path', 'data/trading_bot.db')
         self.backup_interval = config.get('database', {}).get('backup_interval', 3600)
+        # Candle cache lives in its own file, attached to every connection as
+        # `market`: its large, disposable B-trees checkpoint and get cleaned up
+        # independently of the trade ledger, and stay out of ledger backups
+        self.market_db_path = config.get('database', {}).get(
+            'market_data_path', f"{os.path.splitext(self.db_path)[0]}_market.db"
+        )
+        
+        # One long-lived write connection (and its worker thread and page cache)
+        # is shared by every writer; writes are serialized so commits never
+        # interleave. Queries use a second connection on its own thread, so
+        # under WAL they run alongside a write instead of queueing behind it.
+        self._db: Optional[aiosqlite.Connection] = None
+        self._read_db: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._series: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        
+        # Running P&L of closed trades: summed once, then kept current by log_trade_close
+        self._total_pnl: Optional[float] = None
+        
+        # Pending balance_history rows, written in one transaction by _flush_balances
+        self._balance_buffer: List[Tuple] = []
+        self._balance_flush_task: Optional[asyncio.Task] = None
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -33,10 +154,17 @@ class DatabaseManager:
     async def initialize(self):
         """Initialize database tables"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._writer() as db:
                 # Create tables
                 await self._create_tables(db)
+                await self._migrate(db)
+                await self._create_indexes(db)
                 await db.commit()
+                # Seed the running P&L under the write lock, before any close can commit
+                self._total_pnl = await self._sum_closed_pnl(db)
+            
+            if self._balance_flush_task is None:
+                self._balance_flush_task = asyncio.create_task(self._balance_flush_loop())
             
             logger.info("Database initialized successfully")
         
@@ -51,7 +179,7 @@ class DatabaseManager:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS trades (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 symbol TEXT NOT NULL,
                 side TEXT NOT NULL,
                 entry_price REAL NOT NULL,
@@ -76,7 +204,7 @@ class DatabaseManager:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS balance_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 total_balance REAL NOT NULL,
                 available_balance REAL NOT NULL,
                 unrealized_pnl REAL DEFAULT 0,
@@ -110,7 +238,6 @@ class DatabaseManager:
         # Trading pairs performance
         await db.execute('''
             CREATE TABLE IF NOT EXISTS pair_performance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 symbol TEXT NOT NULL,
                 date DATE NOT NULL,
                 trades_count INTEGER DEFAULT 0,
@@ -119,31 +246,43 @@ class DatabaseManager:
                 avg_trade_duration INTEGER DEFAULT 0,
                 volatility REAL DEFAULT 0,
                 volume REAL DEFAULT 0,
-                UNIQUE(symbol, date)
-            )
+                PRIMARY KEY (symbol, date)
+            ) WITHOUT ROWID
         ''')
         
-        # Market data cache
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS market_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+        # Market data series: each (symbol, timeframe) pair is stored once and
+        # candles reference it by integer id instead of repeating both strings
+        await db.execute(f'''
+            CREATE TABLE IF NOT EXISTS market.market_series (
+                id INTEGER PRIMARY KEY,
                 symbol TEXT NOT NULL,
-                timestamp DATETIME NOT NULL,
                 timeframe TEXT NOT NULL,
-                open_price REAL NOT NULL,
-                high_price REAL NOT NULL,
-                low_price REAL NOT NULL,
-                close_price REAL NOT NULL,
-                volume REAL NOT NULL,
-                UNIQUE(symbol, timestamp, timeframe)
+                price_scale INTEGER NOT NULL DEFAULT {DEFAULT_PRICE_SCALE},
+                UNIQUE(symbol, timeframe)
             )
         ''')
         
+        # Market data cache, clustered on its natural key: WITHOUT ROWID stores
+        # each candle once, in (series_id, timestamp) order, instead of in a
+        # rowid table plus a separate unique index
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS market.market_data (
+                series_id INTEGER NOT NULL REFERENCES market_series(id),
+                timestamp INTEGER NOT NULL,
+                open_price INTEGER NOT NULL,     -- price * market_series.price_scale
+                high_price INTEGER NOT NULL,
+                low_price INTEGER NOT NULL,
+                close_price INTEGER NOT NULL,
+                volume REAL NOT NULL,
+                PRIMARY KEY (series_id, timestamp)
+            ) WITHOUT ROWID
+        ''')
+        
         # AI learning data
         await db.execute('''
             CREATE TABLE IF NOT EXISTS ai_learning (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 pattern_name TEXT NOT NULL,
                 success BOOLEAN NOT NULL,
                 confidence REAL NOT NULL,
@@ -156,7 +295,7 @@ class DatabaseManager:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS system_logs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 level TEXT NOT NULL,
                 module TEXT NOT NULL,
                 message TEXT NOT NULL,
@@ -168,7 +307,7 @@ class DatabaseManager:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS config_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 parameter_name TEXT NOT NULL,
                 old_value TEXT,
                 new_value TEXT NOT NULL,
@@ -181,7 +320,7 @@ class DatabaseManager:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS pattern_research (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
                 symbol TEXT NOT NULL,
                 timeframe TEXT NOT NULL,
                 pattern_name TEXT NOT NULL,
@@ -192,25 +331,208 @@ class DatabaseManager:
             )
         ''')
         
-        # Create indexes for better performance
+    async def _create_indexes(self, db: aiosqlite.Connection):
+        """Create indexes (after _migrate, which may rebuild tables)"""
         await db.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
-        await db.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)')
+        # Covering indexes for the closed-trade aggregates (by day, in total and per pair)
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_trades_status_ts_symbol ON trades(status, timestamp, symbol, pnl)')
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol_status_ts ON trades(symbol, status, timestamp, pnl)')
         await db.execute('CREATE INDEX IF NOT EXISTS idx_balance_timestamp ON balance_history(timestamp)')
         await db.execute('CREATE INDEX IF NOT EXISTS idx_performance_date ON performance_metrics(date)')
-        await db.execute('CREATE INDEX IF NOT EXISTS idx_market_data_symbol_time ON market_data(symbol, timestamp)')
         await db.execute('CREATE INDEX IF NOT EXISTS idx_pattern_research_symbol_time ON pattern_research(symbol, timeframe)')
     
+    async def _migrate(self, db: aiosqlite.Connection):
+        """Upgrade databases written by older versions to SCHEMA_VERSION"""
+        async with db.execute('PRAGMA user_version') as cursor:
+            version = (await cursor.fetchone())[0]
+        if version >= SCHEMA_VERSION:
+            return
+        
+        if version < 1:
+            # Timestamps moved from ISO text to INTEGER epoch ms, so range filters
+            # compare integers and reads need no parsing. Text defaults were
+            # CURRENT_TIMESTAMP (UTC), which strftime('%s') reads correctly.
+            for table in TIMESTAMP_TABLES:
+                await db.execute(f'''
+                    UPDATE {table} SET timestamp = CAST(strftime('%s', timestamp) AS INTEGER) * 1000
+                    WHERE typeof(timestamp) = 'text'
+                ''')
+            # Cached candles were stored as local-time text; the cache refills itself
+            await db.execute("DELETE FROM market_data WHERE typeof(timestamp) = 'text'")
+        
+        if version < 2:
+            # Superseded by idx_trades_symbol_status_ts (same leading column)
+            await db.execute('DROP INDEX IF EXISTS idx_trades_symbol')
+        
+        if version < 3:
+            # Candles now reference market_series; the old text-keyed cache is
+            # dropped and rebuilt empty (it refills from the exchange)
+            async with db.execute('PRAGMA table_info(market_data)') as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            if 'symbol' in columns:
+                await db.execute('DROP TABLE market_data')
+                await self._create_tables(db)
+        
+        if version < 4:
+            # Redundant with the WITHOUT ROWID primary key
+            await db.execute('DROP INDEX IF EXISTS idx_market_data_series_time')
+            # (market_data itself is rebuilt WITHOUT ROWID by the version 5 step)
+            if 'WITHOUT ROWID' not in await self._table_sql(db, 'pair_performance'):
+                await self._rebuild_table(db, 'pair_performance', (
+                    'symbol', 'date', 'trades_count', 'total_pnl', 'win_rate',
+                    'avg_trade_duration', 'volatility', 'volume'
+                ))
+        
+        if version < 5:
+            # Candle prices moved from REAL to integers scaled per series
+            series_sql = await self._table_sql(db, 'market_series')
+            if series_sql and 'price_scale' not in series_sql:
+                await db.execute(
+                    f'ALTER TABLE market_series ADD COLUMN price_scale INTEGER NOT NULL DEFAULT {DEFAULT_PRICE_SCALE}'
+                )
+            if 'open_price REAL' in await self._table_sql(db, 'market_data'):
+                scaled = (
+                    f'CAST(ROUND({column} * (SELECT price_scale FROM market_series WHERE id = series_id)) AS INTEGER)'
+                    for column in ('open_price', 'high_price', 'low_price', 'close_price')
+                )
+                await self._rebuild_table(
+                    db, 'market_data',
+                    ('series_id', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+                    ('series_id', 'timestamp', *scaled, 'volume')
+                )
+        
+        if version < 6:
+            # Candle tables moved from the main file to the attached market file
+            for table, columns in (
+                ('market_series', 'id, symbol, timeframe, price_scale'),
+                ('market_data', 'series_id, timestamp, open_price, high_price, low_price, close_price, volume'),
+            ):
+                if await self._table_sql(db, table):
+                    await db.execute(f'''
+                        INSERT OR IGNORE INTO market.{table} ({columns})
+                        SELECT {columns} FROM main.{table}
+                    ''')
+                    await db.execute(f'DROP TABLE main.{table}')
+        
+        await db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        logger.info(f"Database schema migrated from version {version} to {SCHEMA_VERSION}")
+    
+    async def _table_sql(self, db: aiosqlite.Connection, table: str) -> str:
+        """CREATE statement a table currently has in the main file ('' if it does not exist)"""
+        async with db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else ''
+    
+    async def _rebuild_table(self, db: aiosqlite.Connection, table: str, columns: Tuple[str, ...],
+                             source: Optional[Tuple[str, ...]] = None):
+        """Recreate a table with its current definition, copying columns (or source expressions) across"""
+        await db.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+        await self._create_tables(db)
+        await db.execute(f'''
+            INSERT OR REPLACE INTO {table} ({', '.join(columns)})
+            SELECT {', '.join(source or columns)} FROM {table}_old
+        ''')
+        await db.execute(f'DROP TABLE {table}_old')
+    
+    async def _open(self, pragmas: Tuple[str, ...]) -> aiosqlite.Connection:
+        """Open a connection to the database file with the given pragmas"""
+        db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        db.row_factory = aiosqlite.Row
+        await db.execute('ATTACH DATABASE ? AS market', (self.market_db_path,))
+        for pragma in pragmas:
+            await db.execute(pragma)
+            if pragma[7:].split('=')[0] in PER_DATABASE_PRAGMAS:
+                await db.execute(pragma.replace('PRAGMA ', 'PRAGMA market.'))
+        return db
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open the shared write connection on first use"""
+        async with self._connect_lock:
+            if self._db is None:
+                self._db = await self._open(CONNECTION_PRAGMAS)
+        return self._db
+    
+    async def _connect_reader(self) -> aiosqlite.Connection:
+        """Open the shared query connection on first use (after the writer has set up WAL)"""
+        if self._read_db is None:
+            await self._connect()
+            async with self._connect_lock:
+                if self._read_db is None:
+                    self._read_db = await self._open(READER_PRAGMAS)
+        return self._read_db
+    
+    @asynccontextmanager
+    async def _reader(self):
+        """Shared connection for queries"""
+        yield await self._connect_reader()
+    
+    @asynccontextmanager
+    async def _writer(self):
+        """Shared connection held exclusively for one write transaction"""
+        db = await self._connect()
+        async with self._write_lock:
+            try:
+                yield db
+            except BaseException:
+                # Never leave a half-written transaction for the next writer to commit
+                await db.rollback()
+                # Series ids assigned in the rolled-back transaction no longer exist
+                self._series.clear()
+                raise
+    
+    async def _fetch_frame(self, query: str, params=()) -> pd.DataFrame:
+        """Run a query and build a DataFrame straight from the result tuples"""
+        async with self._reader() as db:
+            async with db.execute(query, params) as cursor:
+                # Plain tuples: skip building an sqlite3.Row per result row
+                cursor.row_factory = None
+                rows = await cursor.fetchall()
+                columns = [column[0] for column in cursor.description]
+        return pd.DataFrame.from_records(rows, columns=columns)
+    
+    async def _series_info(self, db: aiosqlite.Connection, symbol: str, timeframe: str,
+                           price_scale: int = DEFAULT_PRICE_SCALE) -> Tuple[int, int]:
+        """(id, price_scale) of a (symbol, timeframe) market series, created with price_scale on first use (call inside _writer)"""
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is None:
+            await db.execute(
+                'INSERT OR IGNORE INTO market_series (symbol, timeframe, price_scale) VALUES (?, ?, ?)',
+                (symbol, timeframe, price_scale)
+            )
+            async with db.execute(
+                'SELECT id, price_scale FROM market_series WHERE symbol = ? AND timeframe = ?', key
+            ) as cursor:
+                series = tuple(await cursor.fetchone())
+            self._series[key] = series
+        return series
+    
     async def close(self):
         """Close database connections"""
+        if self._balance_flush_task is not None:
+            self._balance_flush_task.cancel()
+            try:
+                await self._balance_flush_task
+            except asyncio.CancelledError:
+                pass
+            self._balance_flush_task = None
+        await self._flush_balances()
+        if self._read_db is not None:
+            await self._read_db.close()
+            self._read_db = None
+        if self._db is not None:
+            async with self._write_lock:
+                # Refresh planner statistics for tables whose shape changed this session
+                await self._db.execute('PRAGMA optimize')
+                await self._db.close()
+                self._db = None
         logger.info("Database connections closed")
 
     async def get_recent_pattern_research(self, hours: int = 72, limit: int = 2000) -> List[Dict]:
         """Fetch recent pattern research records"""
         try:
-            cutoff = datetime.now() - timedelta(hours=hours)
-            cutoff_str = cutoff.strftime("%Y-%m-%d %H:%M:%S")
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            cutoff_ms = _now_ms() - hours * 3_600_000
+            async with self._reader() as db:
                 cursor = await db.execute(
                     '''
                     SELECT pattern_name, timeframe, occurrences, success_rate, avg_return, sample_size, timestamp
@@ -219,7 +541,7 @@ class DatabaseManager:
                     ORDER BY timestamp DESC
                     LIMIT ?
                     ''',
-                    (cutoff_str, limit)
+                    (cutoff_ms, limit)
                 )
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -227,22 +549,23 @@ class DatabaseManager:
             logger.error(f"Error fetching recent pattern research: {e}")
             return []
     
-    async def log_trade(self, signal, order: Dict):
-        """Log a new trade"""
+    async def log_trade(self, signal, order: Dict) -> Optional[int]:
+        """Log a new trade and return its row id"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._writer() as db:
                 indicators = None
                 if hasattr(signal, 'indicators'):
                     indicators = self._json_safe(signal.indicators)
                 patterns = []
                 if hasattr(signal, 'patterns'):
                     patterns = self._json_safe(signal.patterns)
-                await db.execute('''
+                cursor = await db.execute('''
                     INSERT INTO trades (
-                        symbol, side, entry_price, quantity, stop_loss, take_profit,
+                        timestamp, symbol, side, entry_price, quantity, stop_loss, take_profit,
                         entry_reason, indicators, patterns, confidence, order_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
+                    _now_ms(),
                     signal.symbol,
                     signal.action,
                     signal.entry_price,
@@ -250,17 +573,19 @@ class DatabaseManager:
                     signal.stop_loss,
                     signal.take_profit,
                     signal.reasoning,
-                    json.dumps(indicators) if indicators is not None else None,
-                    json.dumps(patterns),
+                    _json_dumps(indicators) if indicators is not None else None,
+                    _json_dumps(patterns),
                     signal.confidence,
                     order.get('id')
                 ))
                 await db.commit()
             
             logger.debug(f"Trade logged: {signal.symbol} {signal.action}")
+            return cursor.lastrowid
         
         except Exception as e:
             logger.error(f"Error logging trade: {e}")
+            return None
 
     def _json_safe(self, value: Any) -> Any:
         """Convert objects to JSON-serializable structures"""
@@ -279,19 +604,29 @@ class DatabaseManager:
     async def log_trade_close(self, position, order: Dict, reason: str):
         """Log trade closure"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
+            # Close the exact row by primary key when the position knows it; the
+            # symbol match is only for positions opened before ids were tracked
+            trade_id = getattr(position, 'trade_id', None)
+            if trade_id is not None:
+                where, key = "id = ? AND status = 'open'", trade_id
+            else:
+                where, key = "symbol = ? AND status = 'open'", position.symbol
+            
+            async with self._writer() as db:
+                cursor = await db.execute(f'''
                     UPDATE trades 
                     SET exit_price = ?, pnl = ?, exit_reason = ?, status = 'closed', exit_order_id = ?
-                    WHERE symbol = ? AND status = 'open'
+                    WHERE {where}
                 ''', (
                     position.current_price,
                     position.pnl,
                     reason,
                     order.get('id'),
-                    position.symbol
+                    key
                 ))
                 await db.commit()
+                if self._total_pnl is not None:
+                    self._total_pnl += position.pnl * cursor.rowcount
             
             logger.debug(f"Trade close logged: {position.symbol} P&L: £{position.pnl:.2f}")
         
@@ -303,14 +638,16 @@ class DatabaseManager:
         try:
             if not records:
                 return
-            async with aiosqlite.connect(self.db_path) as db:
+            now_ms = _now_ms()
+            async with self._writer() as db:
                 await db.executemany('''
                     INSERT INTO pattern_research (
-                        symbol, timeframe, pattern_name, occurrences,
+                        timestamp, symbol, timeframe, pattern_name, occurrences,
                         success_rate, avg_return, sample_size
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 ''', [
                     (
+                        now_ms,
                         record.get('symbol'),
                         record.get('timeframe'),
                         record.get('pattern_name'),
@@ -327,30 +664,59 @@ class DatabaseManager:
             logger.error(f"Error saving pattern research: {e}")
     
     async def log_balance(self, balance_data: Dict):
-        """Log account balance"""
+        """Log account balance (buffered; written by the periodic flush)"""
+        self._balance_buffer.append((
+            _now_ms(),
+            balance_data.get('total_balance', 0),
+            balance_data.get('available_balance', 0),
+            balance_data.get('unrealized_pnl', 0),
+            balance_data.get('realized_pnl', 0),
+            balance_data.get('equity', 0)
+        ))
+        if len(self._balance_buffer) >= BALANCE_BUFFER_LIMIT:
+            await self._flush_balances()
+    
+    async def _flush_balances(self):
+        """Write buffered balance samples with one executemany and one commit"""
+        if not self._balance_buffer:
+            return
+        rows, self._balance_buffer = self._balance_buffer, []
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
+            async with self._writer() as db:
+                await db.executemany('''
                     INSERT INTO balance_history (
-                        total_balance, available_balance, unrealized_pnl, realized_pnl, equity
-                    ) VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    balance_data.get('total_balance', 0),
-                    balance_data.get('available_balance', 0),
-                    balance_data.get('unrealized_pnl', 0),
-                    balance_data.get('realized_pnl', 0),
-                    balance_data.get('equity', 0)
-                ))
+                        timestamp, total_balance, available_balance, unrealized_pnl, realized_pnl, equity
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
                 await db.commit()
         
+        except asyncio.CancelledError:
+            # The write was rolled back; keep the samples for close()'s final flush
+            self._requeue_balances(rows)
+            raise
         except Exception as e:
             logger.error(f"Error logging balance: {e}")
+            self._requeue_balances(rows)
     
-    async def get_trades(self, symbol: Optional[str] = None, 
-                        start_date: Optional[datetime] = None,
-                        end_date: Optional[datetime] = None,
-                        status: Optional[str] = None) -> List[Dict]:
-        """Get trades with optional filters"""
+    def _requeue_balances(self, rows: List[tuple]):
+        """Put unwritten samples back ahead of newer ones, keeping at most BALANCE_BUFFER_MAX"""
+        self._balance_buffer[:0] = rows
+        if len(self._balance_buffer) > BALANCE_BUFFER_MAX:
+            dropped = len(self._balance_buffer) - BALANCE_BUFFER_MAX
+            del self._balance_buffer[:dropped]
+            logger.warning(f"Dropped {dropped} oldest buffered balance samples")
+    
+    async def _balance_flush_loop(self):
+        """Flush buffered balance samples every BALANCE_FLUSH_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(BALANCE_FLUSH_INTERVAL)
+            await self._flush_balances()
+    
+    async def get_trades_df(self, symbol: Optional[str] = None, 
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None,
+                            status: Optional[str] = None) -> pd.DataFrame:
+        """Get trades with optional filters as a columnar DataFrame"""
         try:
             query = "SELECT * FROM trades WHERE 1=1"
             params = []
@@ -361,11 +727,11 @@ class DatabaseManager:
             
             if start_date:
                 query += " AND timestamp >= ?"
-                params.append(start_date.isoformat())
+                params.append(_epoch_ms(start_date))
             
             if end_date:
                 query += " AND timestamp <= ?"
-                params.append(end_date.isoformat())
+                params.append(_epoch_ms(end_date))
             
             if status:
                 query += " AND status = ?"
@@ -373,42 +739,64 @@ class DatabaseManager:
             
             query += " ORDER BY timestamp DESC"
             
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                async with db.execute(query, params) as cursor:
-                    rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
+            return await self._fetch_frame(query, params)
         
         except Exception as e:
             logger.error(f"Error getting trades: {e}")
-            return []
+            return pd.DataFrame()
+    
+    async def get_trades(self, symbol: Optional[str] = None, 
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        status: Optional[str] = None) -> List[Dict]:
+        """Get trades with optional filters"""
+        trades = await self.get_trades_df(symbol, start_date, end_date, status)
+        # Keep NULL columns (e.g. pnl of open trades) as None rather than NaN
+        return trades.astype(object).where(trades.notna(), None).to_dict('records')
     
     async def get_daily_performance(self, date: datetime) -> Dict:
         """Get daily performance metrics"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                
+            async with self._reader() as db:
                 # Get trades for the day
                 start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
                 end_date = start_date + timedelta(days=1)
                 
+                # Aggregate in SQL: one row comes back instead of every trade
                 async with db.execute('''
-                    SELECT * FROM trades 
+                    SELECT
+                        COUNT(*),
+                        COALESCE(SUM(pnl > 0), 0),
+                        COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0),
+                        COALESCE(SUM(CASE WHEN pnl < 0 THEN pnl END), 0),
+                        COALESCE(MAX(CASE WHEN pnl > 0 THEN pnl END), 0),
+                        COALESCE(MIN(CASE WHEN pnl < 0 THEN pnl END), 0),
+                        AVG(pnl * pnl)
+                    FROM trades 
                     WHERE timestamp >= ? AND timestamp < ? AND status = 'closed'
-                ''', (start_date.isoformat(), end_date.isoformat())) as cursor:
-                    trades = await cursor.fetchall()
+                ''', (_epoch_ms(start_date), _epoch_ms(end_date))) as cursor:
+                    (total_trades, winning_trades, gross_profit, gross_loss,
+                     largest_win, largest_loss, mean_square) = await cursor.fetchone()
                 
-                if not trades:
+                if not total_trades:
                     return {}
                 
+                # Max drawdown of the day's cumulative P&L curve, computed with
+                # window functions so only the final scalar leaves SQLite
+                async with db.execute('''
+                    SELECT COALESCE(MAX(peak - equity), 0) FROM (
+                        SELECT equity, MAX(equity) OVER (ORDER BY timestamp, id ROWS UNBOUNDED PRECEDING) AS peak
+                        FROM (
+                            SELECT timestamp, id, SUM(pnl) OVER (ORDER BY timestamp, id ROWS UNBOUNDED PRECEDING) AS equity
+                            FROM trades 
+                            WHERE timestamp >= ? AND timestamp < ? AND status = 'closed'
+                        )
+                    )
+                ''', (_epoch_ms(start_date), _epoch_ms(end_date))) as cursor:
+                    (max_drawdown,) = await cursor.fetchone()
+                
                 # Calculate metrics
-                total_trades = len(trades)
-                winning_trades = sum(1 for trade in trades if trade['pnl'] > 0)
                 losing_trades = total_trades - winning_trades
-                
-                gross_profit = sum(trade['pnl'] for trade in trades if trade['pnl'] > 0)
-                gross_loss = sum(trade['pnl'] for trade in trades if trade['pnl'] < 0)
                 net_profit = gross_profit + gross_loss
                 
                 win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
@@ -417,8 +805,10 @@ class DatabaseManager:
                 avg_win = gross_profit / winning_trades if winning_trades > 0 else 0
                 avg_loss = gross_loss / losing_trades if losing_trades > 0 else 0
                 
-                largest_win = max((trade['pnl'] for trade in trades if trade['pnl'] > 0), default=0)
-                largest_loss = min((trade['pnl'] for trade in trades if trade['pnl'] < 0), default=0)
+                # Per-trade Sharpe ratio from the mean and mean square of P&L
+                mean_pnl = net_profit / total_trades
+                variance = mean_square - mean_pnl * mean_pnl
+                sharpe_ratio = mean_pnl / np.sqrt(variance) if variance > 1e-12 else 0
                 
                 return {
                     'date': date.date(),
@@ -433,7 +823,9 @@ class DatabaseManager:
                     'avg_win': avg_win,
                     'avg_loss': avg_loss,
                     'largest_win': largest_win,
-                    'largest_loss': largest_loss
+                    'largest_loss': largest_loss,
+                    'sharpe_ratio': float(sharpe_ratio),
+                    'max_drawdown': max_drawdown
                 }
         
         except Exception as e:
@@ -443,13 +835,14 @@ class DatabaseManager:
     async def save_daily_performance(self, performance_data: Dict):
         """Save daily performance metrics"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._writer() as db:
                 await db.execute('''
                     INSERT OR REPLACE INTO performance_metrics (
                         date, total_trades, winning_trades, losing_trades,
                         gross_profit, gross_loss, net_profit, profit_factor,
-                        win_rate, avg_win, avg_loss, largest_win, largest_loss
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        win_rate, avg_win, avg_loss, largest_win, largest_loss,
+                        sharpe_ratio, max_drawdown
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     performance_data['date'],
                     performance_data['total_trades'],
@@ -463,7 +856,9 @@ class DatabaseManager:
                     performance_data['avg_win'],
                     performance_data['avg_loss'],
                     performance_data['largest_win'],
-                    performance_data['largest_loss']
+                    performance_data['largest_loss'],
+                    performance_data.get('sharpe_ratio', 0),
+                    performance_data.get('max_drawdown', 0)
                 ))
                 await db.commit()
         
@@ -473,39 +868,41 @@ class DatabaseManager:
     async def get_total_pnl(self) -> float:
         """Get total P&L from all closed trades"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                async with db.execute('''
-                    SELECT COALESCE(SUM(pnl), 0) as total_pnl 
-                    FROM trades WHERE status = 'closed'
-                ''') as cursor:
-                    result = await cursor.fetchone()
-                    return result[0] if result else 0.0
+            if self._total_pnl is None:
+                async with self._writer() as db:
+                    if self._total_pnl is None:
+                        self._total_pnl = await self._sum_closed_pnl(db)
+            return self._total_pnl
         
         except Exception as e:
             logger.error(f"Error getting total P&L: {e}")
             return 0.0
     
+    async def _sum_closed_pnl(self, db: aiosqlite.Connection) -> float:
+        """Sum P&L over closed trades (call under the write lock so no close slips past)"""
+        async with db.execute('''
+            SELECT COALESCE(SUM(pnl), 0) as total_pnl 
+            FROM trades WHERE status = 'closed'
+        ''') as cursor:
+            result = await cursor.fetchone()
+            return result[0] if result else 0.0
+    
     async def get_pair_performance(self, symbol: str, days: int = 30) -> Dict:
         """Get performance metrics for a specific trading pair"""
         try:
             start_date = datetime.now() - timedelta(days=days)
             
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                
+            async with self._reader() as db:
                 async with db.execute('''
-                    SELECT * FROM trades 
+                    SELECT COUNT(*), COALESCE(SUM(pnl > 0), 0), COALESCE(SUM(pnl), 0)
+                    FROM trades 
                     WHERE symbol = ? AND timestamp >= ? AND status = 'closed'
-                    ORDER BY timestamp DESC
-                ''', (symbol, start_date.isoformat())) as cursor:
-                    trades = await cursor.fetchall()
+                ''', (symbol, _epoch_ms(start_date))) as cursor:
+                    total_trades, winning_trades, total_pnl = await cursor.fetchone()
                 
-                if not trades:
+                if not total_trades:
                     return {}
                 
-                total_trades = len(trades)
-                winning_trades = sum(1 for trade in trades if trade['pnl'] > 0)
-                total_pnl = sum(trade['pnl'] for trade in trades)
                 win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
                 
                 return {
@@ -521,42 +918,90 @@ class DatabaseManager:
             logger.error(f"Error getting pair performance: {e}")
             return {}
     
-    async def cache_market_data(self, symbol: str, timeframe: str, ohlcv_data: List):
-        """Cache market data"""
+    async def cache_market_data(self, symbol: str, timeframe: str, ohlcv_data: List,
+                                tick_size: Optional[float] = None):
+        """Cache market data (tick_size, e.g. the market's price precision, sets a new series' scale)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                for candle in ohlcv_data:
-                    timestamp = datetime.fromtimestamp(candle[0] / 1000)
-                    await db.execute('''
-                        INSERT OR REPLACE INTO market_data 
-                        (symbol, timestamp, timeframe, open_price, high_price, low_price, close_price, volume)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        symbol, timestamp, timeframe,
-                        candle[1], candle[2], candle[3], candle[4], candle[5]
-                    ))
+            if not ohlcv_data:
+                return
+            ohlc = np.asarray(ohlcv_data, dtype=np.float64)[:, 1:5]
+            # One executemany call inserts every candle in a single transaction
+            # instead of a worker-thread round trip per row
+            async with self._writer() as db:
+                if (symbol, timeframe) in self._series:
+                    series_id, price_scale = self._series[(symbol, timeframe)]
+                else:
+                    series_id, price_scale = await self._series_info(
+                        db, symbol, timeframe, _price_scale(ohlc, tick_size)
+                    )
+                # Scale and round every OHLC price in one vectorized pass
+                prices = np.rint(ohlc * price_scale).astype(np.int64).tolist()
+                rows = [
+                    (series_id, int(candle[0]), *scaled, candle[5])
+                    for candle, scaled in zip(ohlcv_data, prices)
+                ]
+                # Overlapping polls resend mostly unchanged candles: those are
+                # skipped without a write; only a still-forming bar is updated
+                await db.executemany('''
+                    INSERT INTO market_data 
+                    (series_id, timestamp, open_price, high_price, low_price, close_price, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (series_id, timestamp) DO UPDATE SET
+                        open_price = excluded.open_price,
+                        high_price = excluded.high_price,
+                        low_price = excluded.low_price,
+                        close_price = excluded.close_price,
+                        volume = excluded.volume
+                    WHERE (open_price, high_price, low_price, close_price, volume)
+                       IS NOT (excluded.open_price, excluded.high_price, excluded.low_price,
+                               excluded.close_price, excluded.volume)
+                ''', rows)
                 await db.commit()
         
         except Exception as e:
             logger.error(f"Error caching market data: {e}")
     
+    async def get_cached_market_data_df(self, symbol: str, timeframe: str, 
+                                        start_time: datetime, end_time: datetime) -> pd.DataFrame:
+        """Get cached market data as a columnar DataFrame"""
+        try:
+            return await self._fetch_frame('''
+                SELECT m.timestamp,
+                       m.open_price * 1.0 / s.price_scale AS open,
+                       m.high_price * 1.0 / s.price_scale AS high,
+                       m.low_price * 1.0 / s.price_scale AS low,
+                       m.close_price * 1.0 / s.price_scale AS close,
+                       m.volume
+                FROM market_series s JOIN market_data m ON m.series_id = s.id
+                WHERE s.symbol = ? AND s.timeframe = ? 
+                AND m.timestamp >= ? AND m.timestamp <= ?
+                ORDER BY m.timestamp
+            ''', (symbol, timeframe, _epoch_ms(start_time), _epoch_ms(end_time)))
+        
+        except Exception as e:
+            logger.error(f"Error getting cached market data: {e}")
+            return pd.DataFrame()
+    
     async def get_cached_market_data(self, symbol: str, timeframe: str, 
                                    start_time: datetime, end_time: datetime) -> List:
         """Get cached market data"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._reader() as db:
                 async with db.execute('''
-                    SELECT timestamp, open_price, high_price, low_price, close_price, volume
-                    FROM market_data 
-                    WHERE symbol = ? AND timeframe = ? 
-                    AND timestamp >= ? AND timestamp <= ?
-                    ORDER BY timestamp
-                ''', (symbol, timeframe, start_time.isoformat(), end_time.isoformat())) as cursor:
+                    SELECT m.timestamp,
+                           m.open_price * 1.0 / s.price_scale,
+                           m.high_price * 1.0 / s.price_scale,
+                           m.low_price * 1.0 / s.price_scale,
+                           m.close_price * 1.0 / s.price_scale,
+                           m.volume
+                    FROM market_series s JOIN market_data m ON m.series_id = s.id
+                    WHERE s.symbol = ? AND s.timeframe = ? 
+                    AND m.timestamp >= ? AND m.timestamp <= ?
+                    ORDER BY m.timestamp
+                ''', (symbol, timeframe, _epoch_ms(start_time), _epoch_ms(end_time))) as cursor:
                     rows = await cursor.fetchall()
-                    return [[
-                        int(datetime.fromisoformat(row[0]).timestamp() * 1000),
-                        row[1], row[2], row[3], row[4], row[5]
-                    ] for row in rows]
+                    # Timestamps are stored as epoch ms, so rows come back as-is
+                    return [list(row) for row in rows]
         
         except Exception as e:
             logger.error(f"Error getting cached market data: {e}")
@@ -566,14 +1011,14 @@ class DatabaseManager:
                             confidence: float, market_conditions: Dict, parameters: Dict):
         """Log AI learning data"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._writer() as db:
                 await db.execute('''
                     INSERT INTO ai_learning 
-                    (pattern_name, success, confidence, market_conditions, parameters)
-                    VALUES (?, ?, ?, ?, ?)
+                    (timestamp, pattern_name, success, confidence, market_conditions, parameters)
+                    VALUES (?, ?, ?, ?, ?, ?)
                 ''', (
-                    pattern_name, success, confidence,
-                    json.dumps(market_conditions), json.dumps(parameters)
+                    _now_ms(), pattern_name, success, confidence,
+                    _json_dumps(market_conditions), _json_dumps(parameters)
                 ))
                 await db.commit()
         
@@ -587,7 +1032,7 @@ class DatabaseManager:
             start_date = datetime.now() - timedelta(days=days)
             
             query = "SELECT * FROM ai_learning WHERE timestamp >= ?"
-            params = [start_date.isoformat()]
+            params = [_epoch_ms(start_date)]
             
             if pattern_name:
                 query += " AND pattern_name = ?"
@@ -595,8 +1040,7 @@ class DatabaseManager:
             
             query += " ORDER BY timestamp DESC"
             
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self._reader() as db:
                 async with db.execute(query, params) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
@@ -612,9 +1056,14 @@ class DatabaseManager:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_path = f"{self.db_path}.backup_{timestamp}"
             
-            # Simple file copy for SQLite
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            await self._flush_balances()
+            
+            # Online backup from a separate read connection: it copies one WAL
+            # snapshot in a single step, so writers on the shared connection
+            # keep going and the file is never copied mid-transaction
+            async with aiosqlite.connect(self.db_path) as source, \
+                    aiosqlite.connect(backup_path) as target:
+                await source.backup(target)
             
             logger.info(f"Database backed up to: {backup_path}")
             return backup_path
@@ -623,29 +1072,33 @@ class DatabaseManager:
             logger.error(f"Error backing up database: {e}")
             return None
     
+    async def _delete_before(self, table: str, cutoff_ms: int, key: str = 'rowid'):
+        """Delete rows older than cutoff_ms in bounded batches, one short transaction each"""
+        while True:
+            async with self._writer() as db:
+                cursor = await db.execute(f'''
+                    DELETE FROM {table} WHERE ({key}) IN (
+                        SELECT {key} FROM {table} WHERE timestamp < ? LIMIT ?
+                    )
+                ''', (cutoff_ms, CLEANUP_BATCH_SIZE))
+                await db.commit()
+            if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                break
+            # Let queued writers and WAL checkpoints run between batches
+            await asyncio.sleep(0)
+    
     async def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data to manage database size"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             
-            async with aiosqlite.connect(self.db_path) as db:
-                # Clean old market data
-                await db.execute('''
-                    DELETE FROM market_data WHERE timestamp < ?
-                ''', (cutoff_date.isoformat(),))
-                
-                # Clean old system logs
-                await db.execute('''
-                    DELETE FROM system_logs WHERE timestamp < ?
-                ''', (cutoff_date.isoformat(),))
-                
-                # Clean old AI learning data (keep more recent)
-                ai_cutoff = datetime.now() - timedelta(days=days_to_keep // 2)
-                await db.execute('''
-                    DELETE FROM ai_learning WHERE timestamp < ?
-                ''', (ai_cutoff.isoformat(),))
-                
-                await db.commit()
+            # Clean old market data and system logs
+            await self._delete_before('market_data', _epoch_ms(cutoff_date), key='series_id, timestamp')
+            await self._delete_before('system_logs', _epoch_ms(cutoff_date))
+            
+            # Clean old AI learning data (keep more recent)
+            ai_cutoff = datetime.now() - timedelta(days=days_to_keep // 2)
+            await self._delete_before('ai_learning', _epoch_ms(ai_cutoff))
             
             logger.info(f"Cleaned up data older than {days_to_keep} days")
         
@@ -5,18 +5,134 @@ Handles notifications, alerts, and user interactions via Discord
 """
 
 import asyncio
+import functools
+import heapq
+import io
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
 from discord import Webhook
 import aiohttp
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 import os
+import time
 import uuid
+from collections import OrderedDict, defaultdict, deque
+from operator import attrgetter, itemgetter
 from .reporter import ReportGenerator
 
+# Fields of an ai_assistant.ParameterSuggestion, fetched in one call
+_SUGGESTION_FIELDS = attrgetter('current_value', 'suggested_value', 'confidence', 'reason')
+
+# Embed timestamps: timezone-aware UTC, which discord.py sends as-is (naive
+# datetimes are first converted from local time)
+_now = discord.utils.utcnow
+
+# Embed colours, built once instead of per message
+COLOR_BLUE = discord.Color.blue()
+COLOR_BLURPLE = discord.Color.blurple()
+COLOR_GREEN = discord.Color.green()
+COLOR_ORANGE = discord.Color.orange()
+COLOR_PURPLE = discord.Color.purple()
+COLOR_RED = discord.Color.red()
+COLOR_TEAL = discord.Color.teal()
+
+# Discord accepts at most 10 embeds and 6000 embed characters per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# Seconds a built !status / !balance / !positions reply is reused, so users
+# polling a command don't re-query the exchange and rebuild the embed
+COMMAND_CACHE_TTL = {'status': 3.0, 'balance': 10.0, 'positions': 5.0}
+
+# Hours an AI suggestion batch stays approvable
+SUGGESTION_TTL_HOURS = 24
+# Oldest pending suggestion batches are evicted beyond this many
+MAX_PENDING_SUGGESTIONS = 128
+
+# Channel sends allowed per interval (Discord's per-channel bucket is 5 per 5s)
+SEND_TOKEN_LIMIT = 5
+SEND_INTERVAL = 5.0
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _safe_command(name: str, reply: Optional[str] = None):
+    """Wrap a command callback so failures are logged (and optionally answered) in one place"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(ctx, *args, **kwargs):
+            try:
+                return await func(ctx, *args, **kwargs)
+            except Exception as e:
+                logger.error("Error in {} command: {}", name, e)
+                if reply:
+                    await ctx.send(reply)
+        return wrapper
+    return decorator
+
+
+class _InteractionContext:
+    """Minimal ctx stand-in so prefix command bodies can answer slash interactions"""
+
+    def __init__(self, interaction: discord.Interaction):
+        self.interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        if self.interaction.response.is_done():
+            await self.interaction.followup.send(content, **kwargs)
+        else:
+            await self.interaction.response.send_message(content, **kwargs)
+
+
+class SendBucket:
+    """Token bucket that paces sends so bursts queue locally instead of hitting 429s"""
+    
+    def __init__(self, token_limit: int = SEND_TOKEN_LIMIT, interval: float = SEND_INTERVAL):
+        self.token_limit = token_limit
+        self.interval = interval
+        self.tokens = 0
+        self.last_reset = 0.0
+        self._queue: deque = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    def _check(self):
+        """Release waiting sends while tokens remain; re-check when the interval resets"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if now - self.last_reset >= self.interval:
+            self.tokens = 0
+            self.last_reset = now
+        while self._queue and self.tokens < self.token_limit:
+            waiter = self._queue.popleft()
+            if waiter.done():
+                continue  # caller was cancelled while queued
+            self.tokens += 1
+            waiter.set_result(None)
+        if self._queue and self._timer is None:
+            self._timer = loop.call_later(self.last_reset + self.interval - now, self._on_reset)
+    
+    def _on_reset(self):
+        self._timer = None
+        self._check()
+    
+    async def enqueue_send(self, coro_factory, priority: bool = False):
+        """Wait for a token (priority sends jump the queue), then run coro_factory()"""
+        waiter = asyncio.get_running_loop().create_future()
+        if priority:
+            self._queue.appendleft(waiter)
+        else:
+            self._queue.append(waiter)
+        self._check()
+        await waiter
+        return await coro_factory()
+
 
 class DiscordNotifier:
     """Discord bot for trading notifications and interactions"""
@@ -59,20 +175,46 @@ class DiscordNotifier:
         self.webhook_url = self.discord_config.get('webhook_url')
         self.channel_id = int(self.discord_config.get('channel_id', 0))
         self.channel = None
+        # Set by on_ready (or a failed start) so initialize() waits only as long as the login takes
+        self._ready = asyncio.Event()
+        # Slash commands are registered (and synced once) only for a configured guild
+        self.guild_id = int(self.discord_config.get('guild_id') or 0)
+        self._tree_synced = False
+        self._send_bucket = SendBucket()
+        # One pooled HTTP session for webhook fallbacks (opened on first use),
+        # so repeated sends reuse keep-alive connections instead of a new TLS handshake
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._webhook: Optional[Webhook] = None
         
         # Notification settings
         self.notify_trades = self.discord_config.get('notify_trades', True)
         self.notify_errors = self.discord_config.get('notify_errors', True)
         self.notify_daily_report = self.discord_config.get('notify_daily_report', True)
         
+        # Trade, close, AI gate and config-change embeds are coalesced into
+        # multi-embed messages: a batch goes out when full or max_wait_time
+        # seconds after its first embed
+        self.max_batch_size = min(int(self.discord_config.get('max_batch_size', MAX_EMBEDS_PER_MESSAGE)), MAX_EMBEDS_PER_MESSAGE)
+        self.max_wait_time = float(self.discord_config.get('max_wait_time', 0.2))
+        self._pending_embeds: deque = deque()
+        self._embeds_waiting = asyncio.Event()
+        self._embed_batch_full = asyncio.Event()
+        self._embed_flusher_task: Optional[asyncio.Task] = None
+        
         # Report generator
         self.report_generator = ReportGenerator(config)
-        self.pending_suggestions: Dict[str, Dict[str, Any]] = {}
+        self.pending_suggestions: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # (monotonic expiry, suggestion id) min-heap, so pruning only touches expired entries
+        self._suggestion_expiry: List[Tuple[float, str]] = []
+        self._cmd_cache: Dict[str, Tuple[float, Any]] = {}
         self.app_version = self._resolve_app_version()
+        self._version_message = f"🤖 Bot version: `{self.app_version}`"
         
         # Setup bot events and commands
         self._setup_bot_events()
         self._setup_commands()
+        if self.guild_id:
+            self._setup_slash_commands()
         
         logger.info("Discord notifier initialized")
     
@@ -87,10 +229,13 @@ class DiscordNotifier:
             # Start bot in background
             asyncio.create_task(self._start_bot(token))
             
-            # Wait a moment for bot to connect
-            await asyncio.sleep(2)
+            # Wait for the gateway handshake instead of a fixed delay
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                logger.warning("Discord bot not ready after 10s, continuing")
             
-            # Get channel
+            # Get channel (cached once ready; REST fetch only as a fallback)
             if self.channel_id:
                 self.channel = self.bot.get_channel(self.channel_id)
                 if not self.channel:
@@ -99,6 +244,7 @@ class DiscordNotifier:
                     except Exception as e:
                         logger.warning(f"Could not fetch Discord channel: {e}")
                 if self.channel:
+                    self._embed_flusher_task = asyncio.create_task(self._embed_flusher())
                     await self.send_notification("🤖 Trading Bot Connected", "Discord integration active")
                     logger.info(f"Discord bot connected to channel: {self.channel.name}")
                 else:
@@ -132,6 +278,9 @@ class DiscordNotifier:
             await self.bot.start(token)
         except Exception as e:
             logger.error(f"Discord bot error: {e}")
+        finally:
+            # Don't leave initialize() waiting on a bot that is no longer running
+            self._ready.set()
     
     def _setup_bot_events(self):
         """Setup Discord bot events"""
@@ -139,10 +288,18 @@ class DiscordNotifier:
         @self.bot.event
         async def on_ready():
             logger.info(f'Discord bot logged in as {self.bot.user}')
+            self._ready.set()
+            if self.guild_id and not self._tree_synced:
+                try:
+                    await self.bot.tree.sync(guild=discord.Object(id=self.guild_id))
+                    self._tree_synced = True
+                except Exception as e:
+                    logger.error(f"Failed to sync slash commands: {e}")
         
         @self.bot.event
         async def on_message(message):
-            if message.author == self.bot.user:
+            # Channel chatter never reaches the command parser
+            if message.author.bot or not message.content.startswith(self.bot.command_prefix):
                 return
             
             # Process commands
@@ -167,18 +324,19 @@ class DiscordNotifier:
         """Setup Discord bot commands"""
         
         @self.bot.command(name='status')
+        @_safe_command('status')
         async def status_command(ctx):
             """Get bot status"""
-            try:
-                if not self.status_callback:
-                    await ctx.send("Status callback not configured.")
-                    return
+            if not self.status_callback:
+                await ctx.send("Status callback not configured.")
+                return
 
+            async def build_embed():
                 status = await self.status_callback()
                 embed = discord.Embed(
                     title="🤖 Trading Bot Status",
-                    color=discord.Color.blue(),
-                    timestamp=datetime.now()
+                    color=COLOR_BLUE,
+                    timestamp=_now()
                 )
                 embed.add_field(name="Status", value="Running ✅" if status.get("running") else "Stopped ❌", inline=True)
                 embed.add_field(name="Paused", value="Yes" if status.get("paused") else "No", inline=True)
@@ -186,42 +344,44 @@ class DiscordNotifier:
                 active_pairs = status.get("active_pairs", [])
                 embed.add_field(name="Active Pairs", value=str(len(active_pairs)), inline=True)
                 embed.add_field(name="Daily P&L", value=f"£{status.get('daily_pnl', 0):.2f}", inline=True)
-                await ctx.send(embed=embed)
-            except Exception as e:
-                logger.error(f"Error in status command: {e}")
+                return embed
+            
+            await ctx.send(embed=await self._cached('status', build_embed))
         
         @self.bot.command(name='balance')
+        @_safe_command('balance')
         async def balance_command(ctx):
             """Get account balance"""
-            try:
-                if not self.balance_callback:
-                    await ctx.send("Balance callback not configured.")
-                    return
+            if not self.balance_callback:
+                await ctx.send("Balance callback not configured.")
+                return
 
+            async def build_embed():
                 balance = await self.balance_callback()
                 embed = discord.Embed(
                     title="💰 Account Balance",
-                    color=discord.Color.green(),
-                    timestamp=datetime.now()
+                    color=COLOR_GREEN,
+                    timestamp=_now()
                 )
                 embed.add_field(name="Available (USDT)", value=f"{balance:.4f}", inline=True)
-                await ctx.send(embed=embed)
-            except Exception as e:
-                logger.error(f"Error in balance command: {e}")
+                return embed
+            
+            await ctx.send(embed=await self._cached('balance', build_embed))
         
         @self.bot.command(name='positions')
+        @_safe_command('positions')
         async def positions_command(ctx):
             """Get open positions"""
-            try:
-                if not self.positions_callback:
-                    await ctx.send("Positions callback not configured.")
-                    return
+            if not self.positions_callback:
+                await ctx.send("Positions callback not configured.")
+                return
 
+            async def build_embed():
                 positions = await self.positions_callback()
                 embed = discord.Embed(
                     title="📊 Open Positions",
-                    color=discord.Color.orange(),
-                    timestamp=datetime.now()
+                    color=COLOR_ORANGE,
+                    timestamp=_now()
                 )
                 if not positions:
                     embed.add_field(name="No Open Positions", value="All positions closed", inline=False)
@@ -232,139 +392,124 @@ class DiscordNotifier:
                             value=f"Size: {position['size']:.6f}\nP&L: £{position['pnl']:.2f}",
                             inline=False
                         )
-                await ctx.send(embed=embed)
-            except Exception as e:
-                logger.error(f"Error in positions command: {e}")
+                return embed
+            
+            await ctx.send(embed=await self._cached('positions', build_embed))
 
         @self.bot.command(name='blocked')
+        @_safe_command('blocked', reply="❌ Error fetching blocked pairs.")
         async def blocked_command(ctx):
             """List restricted pairs"""
-            try:
-                if not self.blocked_callback:
-                    await ctx.send("Blocked list not configured.")
-                    return
-
-                blocked = await self.blocked_callback()
-                if not blocked:
-                    await ctx.send("✅ No blocked pairs yet.")
-                    return
-
-                header = f"🚫 Blocked pairs ({len(blocked)}):\n"
-                chunks = []
-                current = header
-                for pair in blocked:
-                    line = f"{pair}\n"
-                    if len(current) + len(line) > 1900:
-                        chunks.append(current.rstrip())
-                        current = line
-                    else:
-                        current += line
-                if current.strip():
+            if not self.blocked_callback:
+                await ctx.send("Blocked list not configured.")
+                return
+
+            blocked = await self.blocked_callback()
+            if not blocked:
+                await ctx.send("✅ No blocked pairs yet.")
+                return
+
+            header = f"🚫 Blocked pairs ({len(blocked)}):\n"
+            chunks = []
+            current = header
+            for pair in blocked:
+                line = f"{pair}\n"
+                if len(current) + len(line) > 1900:
                     chunks.append(current.rstrip())
+                    current = line
+                else:
+                    current += line
+            if current.strip():
+                chunks.append(current.rstrip())
 
-                for chunk in chunks:
-                    await ctx.send(chunk)
-            except Exception as e:
-                logger.error(f"Error in blocked command: {e}")
-                await ctx.send("❌ Error fetching blocked pairs.")
+            for chunk in chunks:
+                await ctx.send(chunk)
         
         @self.bot.command(name='stop')
         @commands.has_permissions(administrator=True)
+        @_safe_command('stop')
         async def stop_command(ctx):
             """Emergency stop trading"""
-            try:
-                if not self.stop_callback:
-                    await ctx.send("Stop callback not configured.")
-                    return
+            if not self.stop_callback:
+                await ctx.send("Stop callback not configured.")
+                return
 
-                await self.stop_callback()
-                embed = discord.Embed(
-                    title="🛑 Emergency Stop",
-                    description="Trading bot stop requested.",
-                    color=discord.Color.red(),
-                    timestamp=datetime.now()
-                )
-                await ctx.send(embed=embed)
-            except Exception as e:
-                logger.error(f"Error in stop command: {e}")
+            await self.stop_callback()
+            self._cmd_cache.pop('status', None)
+            embed = discord.Embed(
+                title="🛑 Emergency Stop",
+                description="Trading bot stop requested.",
+                color=COLOR_RED,
+                timestamp=_now()
+            )
+            await ctx.send(embed=embed)
         
         @self.bot.command(name='report')
+        @_safe_command('report', reply="❌ Error generating report")
         async def report_command(ctx):
             """Generate and send trading report"""
-            try:
-                await ctx.send("📊 Generating trading report...")
-                
-                # Generate report
-                report_path = await self.report_generator.generate_daily_report()
-                
-                if report_path and os.path.exists(report_path):
-                    with open(report_path, 'rb') as f:
-                        file = discord.File(f, filename="trading_report.pdf")
-                        await ctx.send("📈 Daily Trading Report", file=file)
-                else:
-                    await ctx.send("❌ Failed to generate report")
+            await ctx.send("📊 Generating trading report...")
             
-            except Exception as e:
-                logger.error(f"Error in report command: {e}")
-                await ctx.send("❌ Error generating report")
+            # Generate report
+            report_path = await self.report_generator.generate_daily_report()
+            file = await self._load_file(report_path, "trading_report.pdf")
+            
+            if file:
+                await ctx.send("📈 Daily Trading Report", file=file)
+            else:
+                await ctx.send("❌ Failed to generate report")
 
         @self.bot.command(name='version')
+        @_safe_command('version')
         async def version_command(ctx):
             """Show bot version"""
-            try:
-                await ctx.send(f"🤖 Bot version: `{self.app_version}`")
-            except Exception as e:
-                logger.error(f"Error in version command: {e}")
+            await ctx.send(self._version_message)
 
         @self.bot.command(name='commands')
+        @_safe_command('commands')
         async def commands_command(ctx):
             """List available bot commands"""
-            try:
-                embed = discord.Embed(
-                    title="🤖 Available Commands",
-                    color=discord.Color.blurple(),
-                    timestamp=datetime.now()
-                )
-                embed.add_field(
-                    name="General",
-                    value="`!status` `!balance` `!positions` `!blocked` `!report` `!version` `!commands`",
-                    inline=False
-                )
-                embed.add_field(
-                    name="Admin",
-                    value="`!pause` `!resume` `!stop` `!optimize` `!suggestions` `!approve <id>` "
-                          "`!reject <id>` `!configsuggest`",
-                    inline=False
-                )
-                await ctx.send(embed=embed)
-            except Exception as e:
-                logger.error(f"Error in commands command: {e}")
+            embed = discord.Embed(
+                title="🤖 Available Commands",
+                color=COLOR_BLURPLE,
+                timestamp=_now()
+            )
+            embed.add_field(
+                name="General",
+                value="`!status` `!balance` `!positions` `!blocked` `!report` `!version` `!commands`",
+                inline=False
+            )
+            embed.add_field(
+                name="Admin",
+                value="`!pause` `!resume` `!stop` `!optimize` `!suggestions` `!approve <id>` "
+                      "`!reject <id>` `!configsuggest`",
+                inline=False
+            )
+            await ctx.send(embed=embed)
 
         @self.bot.command(name='pause')
         @commands.has_permissions(administrator=True)
+        @_safe_command('pause')
         async def pause_command(ctx):
             """Pause trading"""
-            try:
-                if not self.pause_callback:
-                    await ctx.send("Pause callback not configured.")
-                    return
-                await self.pause_callback()
-                await ctx.send("⏸️ Trading paused.")
-            except Exception as e:
-                logger.error(f"Error in pause command: {e}")
+            if not self.pause_callback:
+                await ctx.send("Pause callback not configured.")
+                return
+            await self.pause_callback()
+            self._cmd_cache.pop('status', None)
+            await ctx.send("⏸️ Trading paused.")
 
         @self.bot.command(name='resume')
         @commands.has_permissions(administrator=True)
+        @_safe_command('resume')
         async def resume_command(ctx):
             """Resume trading"""
-            try:
-                if not self.resume_callback:
-                    await ctx.send("Resume callback not configured.")
-                    return
-                await self.resume_callback()
-                await ctx.send("▶️ Trading resumed.")
-            except Exception as e:
-                logger.error(f"Error in resume command: {e}")
+            if not self.resume_callback:
+                await ctx.send("Resume callback not configured.")
+                return
+            await self.resume_callback()
+            self._cmd_cache.pop('status', None)
+            await ctx.send("▶️ Trading resumed.")
 
         @self.bot.command(name='suggestions')
         @commands.has_permissions(administrator=True)
@@ -470,20 +615,108 @@ class DiscordNotifier:
                 if chart_path:
                     await self.send_research_chart(chart_path, "Latest research snapshot")
     
+    def _setup_slash_commands(self):
+        """Expose the most used commands as guild slash commands, reusing the prefix command bodies"""
+        guild = discord.Object(id=self.guild_id)
+        tree = self.bot.tree
+        # Handlers that wait on the exchange or config callbacks defer first: Discord drops
+        # interactions unanswered after 3s, and _InteractionContext then replies via followup
+
+        @tree.command(name='status', description="Get bot status", guild=guild)
+        async def status_slash(interaction: discord.Interaction):
+            await interaction.response.defer()
+            await self.bot.get_command('status').callback(_InteractionContext(interaction))
+
+        @tree.command(name='balance', description="Get account balance", guild=guild)
+        async def balance_slash(interaction: discord.Interaction):
+            await interaction.response.defer()
+            await self.bot.get_command('balance').callback(_InteractionContext(interaction))
+
+        @tree.command(name='suggestions', description="List pending AI config suggestions", guild=guild)
+        @app_commands.default_permissions(administrator=True)
+        @app_commands.checks.has_permissions(administrator=True)
+        async def suggestions_slash(interaction: discord.Interaction):
+            await self.bot.get_command('suggestions').callback(_InteractionContext(interaction))
+
+        @tree.command(name='approve', description="Approve and apply a pending suggestion batch", guild=guild)
+        @app_commands.default_permissions(administrator=True)
+        @app_commands.checks.has_permissions(administrator=True)
+        async def approve_slash(interaction: discord.Interaction, suggestion_id: str):
+            await interaction.response.defer()
+            await self.bot.get_command('approve').callback(_InteractionContext(interaction), suggestion_id)
+
+        @tree.command(name='reject', description="Reject a pending suggestion batch", guild=guild)
+        @app_commands.default_permissions(administrator=True)
+        @app_commands.checks.has_permissions(administrator=True)
+        async def reject_slash(interaction: discord.Interaction, suggestion_id: str):
+            await self.bot.get_command('reject').callback(_InteractionContext(interaction), suggestion_id)
+
+        @tree.error
+        async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+            """Handle slash command errors with user feedback"""
+            ctx = _InteractionContext(interaction)
+            if isinstance(error, app_commands.MissingPermissions):
+                await ctx.send("❌ You need Administrator permission to use this command.", ephemeral=True)
+                return
+            logger.error(f"Slash command error: {error}")
+            await ctx.send("❌ Command failed. Check logs for details.", ephemeral=True)
+
+    async def _cached(self, key: str, producer):
+        """Return the cached result of producer() for key, rebuilding it once COMMAND_CACHE_TTL expires"""
+        now = time.monotonic()
+        cached = self._cmd_cache.get(key)
+        if cached and now - cached[0] < COMMAND_CACHE_TTL[key]:
+            return cached[1]
+        value = await producer()
+        self._cmd_cache[key] = (now, value)
+        return value
+    
     async def close(self):
         """Close Discord bot"""
         try:
             if hasattr(self, 'daily_report_task'):
                 self.daily_report_task.cancel()
             
+            if self._embed_flusher_task:
+                self._embed_flusher_task.cancel()
+                try:
+                    await self._embed_flusher_task
+                except asyncio.CancelledError:
+                    pass
+                self._embed_flusher_task = None
+                # Deliver whatever was still waiting (e.g. shutdown position closes)
+                await self._flush_embeds()
+            
             if self.bot:
                 await self.bot.close()
             
+            if self._http_session and not self._http_session.closed:
+                await self._http_session.close()
+            
             logger.info("Discord bot closed")
         except Exception as e:
             logger.error(f"Error closing Discord bot: {e}")
     
-    async def send_notification(self, title: str, message: str, color: discord.Color = discord.Color.blue()):
+    async def _load_file(self, path: Optional[str], filename: str) -> Optional[discord.File]:
+        """Read an attachment in a worker thread so large reports don't block the event loop
+
+        Returns None when the file is missing; the read doubles as the existence check.
+        """
+        if not path:
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(None, _read_bytes, path)
+        except FileNotFoundError:
+            return None
+        return discord.File(io.BytesIO(data), filename=filename)
+    
+    async def _send(self, priority: bool = False, **kwargs):
+        """Send to the notification channel through the rate-limit bucket"""
+        return await self._send_bucket.enqueue_send(lambda: self.channel.send(**kwargs), priority)
+    
+    async def send_notification(self, title: str, message: str, color: discord.Color = COLOR_BLUE,
+                                priority: bool = False):
         """Send a general notification"""
         try:
             if not self.channel:
@@ -493,10 +726,10 @@ class DiscordNotifier:
                 title=title,
                 description=message,
                 color=color,
-                timestamp=datetime.now()
+                timestamp=_now()
             )
             
-            await self.channel.send(embed=embed)
+            await self._send(priority, embed=embed)
         
         except Exception as e:
             logger.error(f"Error sending notification: {e}")
@@ -510,12 +743,11 @@ class DiscordNotifier:
                 return
             
             # Determine color based on trade direction
-            color = discord.Color.green() if signal.action == 'buy' else discord.Color.red()
+            color = COLOR_GREEN if signal.action == 'buy' else COLOR_RED
             
             embed = discord.Embed(
                 title=f"{'📈' if signal.action == 'buy' else '📉'} Trade Executed",
-                color=color,
-                timestamp=datetime.now()
+                color=color
             )
 
             def _fmt_price(value: float) -> str:
@@ -545,7 +777,7 @@ class DiscordNotifier:
             if signal.reasoning:
                 embed.add_field(name="Reasoning", value=signal.reasoning, inline=False)
             
-            await self.channel.send(embed=embed)
+            self._queue_embed(embed)
         
         except Exception as e:
             logger.error(f"Error sending trade notification: {e}")
@@ -557,12 +789,11 @@ class DiscordNotifier:
                 return
             
             # Determine color based on P&L
-            color = discord.Color.green() if position.pnl > 0 else discord.Color.red()
+            color = COLOR_GREEN if position.pnl > 0 else COLOR_RED
             
             embed = discord.Embed(
                 title=f"{'✅' if position.pnl > 0 else '❌'} Position Closed",
-                color=color,
-                timestamp=datetime.now()
+                color=color
             )
             
             embed.add_field(name="Symbol", value=position.symbol, inline=True)
@@ -575,7 +806,7 @@ class DiscordNotifier:
             
             embed.add_field(name="Reason", value=reason, inline=False)
             
-            await self.channel.send(embed=embed)
+            self._queue_embed(embed)
         
         except Exception as e:
             logger.error(f"Error sending position close notification: {e}")
@@ -589,7 +820,8 @@ class DiscordNotifier:
             await self.send_notification(
                 "❌ Error Alert",
                 f"```{error_message}```",
-                discord.Color.red()
+                COLOR_RED,
+                priority=True
             )
         
         except Exception as e:
@@ -612,10 +844,22 @@ class DiscordNotifier:
                 return
 
             suggestion_id = uuid.uuid4().hex[:8]
+            if len(self.pending_suggestions) >= MAX_PENDING_SUGGESTIONS:
+                evicted, _ = self.pending_suggestions.popitem(last=False)
+                logger.info(f"Evicted AI suggestion {evicted} (pending limit reached)")
+                # Drop expiry entries of evicted batches once they outnumber live ones
+                if len(self._suggestion_expiry) >= 2 * MAX_PENDING_SUGGESTIONS:
+                    self._suggestion_expiry = [
+                        item for item in self._suggestion_expiry if item[1] in self.pending_suggestions
+                    ]
+                    heapq.heapify(self._suggestion_expiry)
             self.pending_suggestions[suggestion_id] = {
-                "suggestions": normalized,
-                "created_at": datetime.now()
+                "suggestions": normalized
             }
+            heapq.heappush(
+                self._suggestion_expiry,
+                (time.monotonic() + SUGGESTION_TTL_HOURS * 3600, suggestion_id)
+            )
 
             description = (
                 "The AI assistant suggests the following config updates.\n"
@@ -627,8 +871,8 @@ class DiscordNotifier:
             embed = discord.Embed(
                 title=title,
                 description=description,
-                color=discord.Color.purple(),
-                timestamp=datetime.now()
+                color=COLOR_PURPLE,
+                timestamp=_now()
             )
 
             for param, suggestion in normalized.items():
@@ -643,12 +887,12 @@ class DiscordNotifier:
                     inline=False
                 )
             
-            if chart_path and os.path.exists(chart_path):
-                file = discord.File(chart_path, filename="research_summary.png")
+            file = await self._load_file(chart_path, "research_summary.png")
+            if file:
                 embed.set_image(url="attachment://research_summary.png")
-                await self.channel.send(embed=embed, file=file)
+                await self._send(embed=embed, file=file)
             else:
-                await self.channel.send(embed=embed)
+                await self._send(embed=embed)
             
         except Exception as e:
             logger.error(f"Error sending AI suggestions: {e}")
@@ -656,18 +900,20 @@ class DiscordNotifier:
     async def send_research_chart(self, chart_path: str, message: Optional[str] = None):
         """Send a research chart image to Discord"""
         try:
-            if not self.channel or not chart_path or not os.path.exists(chart_path):
+            if not self.channel:
+                return
+            file = await self._load_file(chart_path, "research_summary.png")
+            if not file:
                 return
 
             embed = discord.Embed(
                 title="📊 Research Snapshot",
                 description=message or "",
-                color=discord.Color.teal(),
-                timestamp=datetime.now()
+                color=COLOR_TEAL,
+                timestamp=_now()
             )
-            file = discord.File(chart_path, filename="research_summary.png")
             embed.set_image(url="attachment://research_summary.png")
-            await self.channel.send(embed=embed, file=file)
+            await self._send(embed=embed, file=file)
         except Exception as e:
             logger.error(f"Error sending research chart: {e}")
 
@@ -683,15 +929,14 @@ class DiscordNotifier:
 
             embed = discord.Embed(
                 title=f"🤖 AI Gate {'Approved' if approve else 'Rejected'}",
-                color=discord.Color.green() if approve else discord.Color.red(),
-                timestamp=datetime.now()
+                color=COLOR_GREEN if approve else COLOR_RED
             )
             embed.add_field(name="Symbol", value=signal.symbol, inline=True)
             embed.add_field(name="Action", value=signal.action.upper(), inline=True)
             embed.add_field(name="Confidence", value=f"{confidence:.2f}", inline=True)
             embed.add_field(name="Reason", value=reason, inline=False)
 
-            await self.channel.send(embed=embed)
+            self._queue_embed(embed)
         except Exception as e:
             logger.error(f"Error sending AI gating log: {e}")
 
@@ -707,8 +952,7 @@ class DiscordNotifier:
 
             embed = discord.Embed(
                 title="🛠️ Config Update Applied",
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
+                color=COLOR_BLUE
             )
 
             if applied:
@@ -720,7 +964,7 @@ class DiscordNotifier:
             if errors:
                 embed.add_field(name="Errors", value="\n".join(errors), inline=False)
 
-            await self.channel.send(embed=embed)
+            self._queue_embed(embed)
         except Exception as e:
             logger.error(f"Error sending config change log: {e}")
 
@@ -730,37 +974,33 @@ class DiscordNotifier:
             if not self.channel:
                 return
 
-            # Aggregate by pattern + timeframe
-            summary = {}
+            # Occurrence-weighted sums per (pattern, timeframe): [occurrences, success, return]
+            summary = defaultdict(lambda: [0, 0.0, 0.0])
             for record in results:
-                key = f"{record.get('pattern_name')} ({record.get('timeframe')})"
                 occ = record.get('occurrences', 0)
-                success = record.get('success_rate', 0) * occ
-                avg_ret = record.get('avg_return', 0) * occ
-                if key not in summary:
-                    summary[key] = {"occurrences": 0, "success": 0.0, "avg_ret": 0.0}
-                summary[key]["occurrences"] += occ
-                summary[key]["success"] += success
-                summary[key]["avg_ret"] += avg_ret
-
-            ranked = sorted(
-                summary.items(),
-                key=lambda item: (item[1]["success"] / item[1]["occurrences"]) if item[1]["occurrences"] else 0,
-                reverse=True
+                totals = summary[(record.get('pattern_name'), record.get('timeframe'))]
+                totals[0] += occ
+                totals[1] += record.get('success_rate', 0) * occ
+                totals[2] += record.get('avg_return', 0) * occ
+
+            # Ratios computed once; only the top five get formatted
+            ranked = heapq.nlargest(
+                5,
+                ((success / occ, avg_ret / occ, occ, pattern, timeframe)
+                 for (pattern, timeframe), (occ, success, avg_ret) in summary.items() if occ),
+                key=itemgetter(0)
             )
 
-            lines = []
-            for name, data in ranked[:5]:
-                occ = data["occurrences"] or 1
-                success_rate = data["success"] / occ
-                avg_ret = data["avg_ret"] / occ
-                lines.append(f"{name}: {success_rate*100:.1f}% success, avg return {avg_ret*100:.2f}% (n={occ})")
+            lines = [
+                f"{pattern} ({timeframe}): {success_rate*100:.1f}% success, avg return {avg_ret*100:.2f}% (n={occ})"
+                for success_rate, avg_ret, occ, pattern, timeframe in ranked
+            ]
 
             embed = discord.Embed(
                 title="📊 Pattern Research Summary",
                 description="\n".join(lines) if lines else "No significant patterns found.",
-                color=discord.Color.teal(),
-                timestamp=datetime.now()
+                color=COLOR_TEAL,
+                timestamp=_now()
             )
             embed.add_field(
                 name="Requests Used",
@@ -768,7 +1008,7 @@ class DiscordNotifier:
                 inline=True
             )
 
-            await self.channel.send(embed=embed)
+            await self._send(embed=embed)
         except Exception as e:
             logger.error(f"Error sending research summary: {e}")
 
@@ -777,56 +1017,114 @@ class DiscordNotifier:
         normalized = {}
         for param, suggestion in (suggestions or {}).items():
             if isinstance(suggestion, dict):
-                normalized[param] = {
-                    "current": suggestion.get("current_value", suggestion.get("current")),
-                    "suggested": suggestion.get("suggested_value", suggestion.get("suggested")),
-                    "confidence": suggestion.get("confidence"),
-                    "reason": suggestion.get("reason")
-                }
+                # Only fall back to the short keys when the long ones are absent
+                current = suggestion["current_value"] if "current_value" in suggestion else suggestion.get("current")
+                suggested = suggestion["suggested_value"] if "suggested_value" in suggestion else suggestion.get("suggested")
+                confidence = suggestion.get("confidence")
+                reason = suggestion.get("reason")
             else:
+                try:
+                    current, suggested, confidence, reason = _SUGGESTION_FIELDS(suggestion)
+                except AttributeError:
+                    current = getattr(suggestion, "current_value", None)
+                    suggested = getattr(suggestion, "suggested_value", None)
+                    confidence = getattr(suggestion, "confidence", None)
+                    reason = getattr(suggestion, "reason", None)
+
+            # Filter to items that have a suggested value
+            if suggested is not None:
                 normalized[param] = {
-                    "current": getattr(suggestion, "current_value", None),
-                    "suggested": getattr(suggestion, "suggested_value", None),
-                    "confidence": getattr(suggestion, "confidence", None),
-                    "reason": getattr(suggestion, "reason", None)
+                    "current": current,
+                    "suggested": suggested,
+                    "confidence": confidence,
+                    "reason": reason
                 }
 
-        # Filter to items that have a suggested value
-        return {k: v for k, v in normalized.items() if v.get("suggested") is not None}
+        return normalized
 
-    def _prune_pending_suggestions(self, max_age_hours: int = 24):
+    def _prune_pending_suggestions(self):
         """Remove expired suggestions without applying changes"""
-        cutoff = datetime.now() - timedelta(hours=max_age_hours)
-        expired = [key for key, value in self.pending_suggestions.items() if value.get("created_at") < cutoff]
-        for key in expired:
-            self.pending_suggestions.pop(key, None)
+        now = time.monotonic()
+        while self._suggestion_expiry and self._suggestion_expiry[0][0] <= now:
+            _, key = heapq.heappop(self._suggestion_expiry)
+            # Approved or rejected batches are already gone
+            if self.pending_suggestions.pop(key, None) is None:
+                continue
             logger.info(f"Expired AI suggestion {key} (no changes applied)")
             try:
                 asyncio.create_task(
                     self.send_notification(
                         "⏳ AI Suggestion Expired",
-                        f"Suggestion `{key}` expired after {max_age_hours} hours. No changes applied."
+                        f"Suggestion `{key}` expired after {SUGGESTION_TTL_HOURS} hours. No changes applied."
                     )
                 )
             except Exception as exc:
                 logger.error(f"Failed to send expiration notice: {exc}")
     
+    def _queue_embed(self, embed: discord.Embed):
+        """Queue an embed for the next batched message"""
+        self._pending_embeds.append(embed)
+        self._embeds_waiting.set()
+        if len(self._pending_embeds) >= self.max_batch_size:
+            self._embed_batch_full.set()
+    
+    async def _flush_embeds(self):
+        """Send every pending embed, packing as many per message as Discord allows"""
+        while self._pending_embeds:
+            batch = [self._pending_embeds.popleft()]
+            chars = len(batch[0])
+            while self._pending_embeds and len(batch) < self.max_batch_size:
+                size = len(self._pending_embeds[0])
+                if chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                    break
+                batch.append(self._pending_embeds.popleft())
+                chars += size
+            # One timestamp per message rather than a clock read per embed
+            timestamp = _now()
+            for embed in batch:
+                embed.timestamp = timestamp
+            try:
+                await self._send(embeds=batch)
+            except asyncio.CancelledError:
+                # Put the unsent batch back so close() can still deliver it
+                self._pending_embeds.extendleft(reversed(batch))
+                raise
+            except Exception as e:
+                logger.error(f"Error sending notification batch: {e}")
+        self._embeds_waiting.clear()
+        self._embed_batch_full.clear()
+    
+    async def _embed_flusher(self):
+        """Coalesce queued embeds into multi-embed messages"""
+        while True:
+            # Wait for a first embed, then give the burst max_wait_time to fill a batch
+            await self._embeds_waiting.wait()
+            try:
+                await asyncio.wait_for(self._embed_batch_full.wait(), self.max_wait_time)
+            except asyncio.TimeoutError:
+                pass
+            await self._flush_embeds()
+    
     async def _send_webhook_message(self, title: str, message: str):
         """Send message via webhook as fallback"""
         try:
             if not self.webhook_url:
                 return
             
-            async with aiohttp.ClientSession() as session:
-                webhook = Webhook.from_url(self.webhook_url, session=session)
-                
-                embed = discord.Embed(
-                    title=title,
-                    description=message,
-                    timestamp=datetime.now()
+            if self._http_session is None or self._http_session.closed:
+                self._http_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=32, limit_per_host=8, keepalive_timeout=75, ttl_dns_cache=300)
                 )
-                
-                await webhook.send(embed=embed)
+                # The webhook is bound to the session, so rebuild it alongside
+                self._webhook = Webhook.from_url(self.webhook_url, session=self._http_session)
+            
+            embed = discord.Embed(
+                title=title,
+                description=message,
+                timestamp=_now()
+            )
+            
+            await self._webhook.send(embed=embed)
         
         except Exception as e:
             logger.error(f"Error sending webhook message: {e}")
@@ -842,18 +1140,17 @@ class DiscordNotifier:
             
             # Generate report
             report_path = await self.report_generator.generate_daily_report()
+            file = await self._load_file(report_path, f"trading_report_{datetime.now().strftime('%Y%m%d')}.pdf")
             
-            if report_path and os.path.exists(report_path):
+            if file:
                 embed = discord.Embed(
                     title="📊 Daily Trading Report",
                     description=f"Daily report for {datetime.now().strftime('%Y-%m-%d')}",
-                    color=discord.Color.blue(),
-                    timestamp=datetime.now()
+                    color=COLOR_BLUE,
+                    timestamp=_now()
                 )
                 
-                with open(report_path, 'rb') as f:
-                    file = discord.File(f, filename=f"trading_report_{datetime.now().strftime('%Y%m%d')}.pdf")
-                    await self.channel.send(embed=embed, file=file)
+                await self._send(embed=embed, file=file)
             else:
                 await self.send_error("Failed to generate daily report")
         
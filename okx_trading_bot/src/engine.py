@@ -21,9 +21,9 @@ from .indicators import TechnicalIndicators
 from .risk import RiskManager
 from .okx_client import OKXClient
 from .discord_bot import DiscordNotifier
-from .ai_assistant import AIAssistant
 from .database import DatabaseManager
 from .research import PatternResearcher
+from .config import apply_env_overrides, load_yaml_config
 
 
 @dataclass
@@ -53,6 +53,7 @@ class Position:
     take_profit: float
     pnl: float
     timestamp: datetime
+    trade_id: Optional[int] = None  # trades row id, set once the trade is logged
 
 
 class TradingEngine:
@@ -63,6 +64,7 @@ class TradingEngine:
         self.config_path = config_path
         self.config = self._load_config(config_path)
         self.running = False
+        self.connected = False
         self.trading_paused = False
         self.last_pair_selection = 0
         self.active_pairs = []
@@ -93,7 +95,8 @@ class TradingEngine:
             positions_callback=self._get_positions,
             blocked_callback=self._get_blocked_pairs
         )
-        self.ai_assistant = AIAssistant(self.config)
+        self.ai_assistant = None
+        self.ensure_ai()
         self.db = DatabaseManager(self.config)
         self.researcher = PatternResearcher(
             self.config,
@@ -111,19 +114,11 @@ class TradingEngine:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
+            config = load_yaml_config(config_path)
 
             # Load environment variables into config (OKX/Discord)
             load_dotenv()
-            if 'okx' in config:
-                config['okx']['api_key'] = os.getenv('OKX_API_KEY', config['okx'].get('api_key', ''))
-                config['okx']['secret_key'] = os.getenv('OKX_SECRET_KEY', config['okx'].get('secret_key', ''))
-                config['okx']['passphrase'] = os.getenv('OKX_PASSPHRASE', config['okx'].get('passphrase', ''))
-            if 'discord' in config:
-                config['discord']['bot_token'] = os.getenv('DISCORD_BOT_TOKEN', config['discord'].get('bot_token', ''))
-                config['discord']['channel_id'] = os.getenv('DISCORD_CHANNEL_ID', config['discord'].get('channel_id', ''))
-                config['discord']['webhook_url'] = os.getenv('DISCORD_WEBHOOK_URL', config['discord'].get('webhook_url', ''))
+            apply_env_overrides(config)
 
             logger.info(f"Configuration loaded from {config_path}")
             return config
@@ -157,16 +152,39 @@ class TradingEngine:
         except Exception:
             return default
     
+    def ensure_ai(self):
+        """Create the AI assistant on first use, only when it is enabled in config"""
+        if self.ai_assistant or not self.config.get('ai_assistant', {}).get('enabled', True):
+            return self.ai_assistant
+        # Deferred: pulls in scikit-learn and the Ollama client
+        from .ai_assistant import AIAssistant
+        self.ai_assistant = AIAssistant(self.config)
+        if getattr(self, 'researcher', None):
+            self.researcher.ai_assistant = self.ai_assistant
+        return self.ai_assistant
+    
+    async def connect_all(self):
+        """Initialize exchange, Discord and database connections concurrently"""
+        if self.connected:
+            return
+        await asyncio.gather(
+            self.okx_client.initialize(),
+            self.discord.initialize(),
+            self.db.initialize()
+        )
+        self.connected = True
+    
     async def start(self):
         """Start the trading engine"""
         logger.info("Starting trading engine...")
         self.running = True
         
-        # Initialize components
-        await self.okx_client.initialize()
+        # Initialize components (no-op if the caller already connected)
+        await self.connect_all()
+        if not self.running:
+            logger.info("Stop requested during startup, skipping trading loop")
+            return
         await self._sync_live_balance("startup")
-        await self.discord.initialize()
-        await self.db.initialize()
         
         # Send startup notification
         base_currency = self.config.get('trading', {}).get('base_currency', 'USDT')
@@ -199,6 +217,8 @@ class TradingEngine:
         await self.okx_client.close()
         await self.discord.close()
         await self.db.close()
+        if self.ai_assistant:
+            await self.ai_assistant.close()
     
     async def _main_loop(self):
         """Main trading loop"""
@@ -651,7 +671,7 @@ class TradingEngine:
                 await self._place_exit_orders(position)
                 
                 # Log trade
-                await self.db.log_trade(signal, order)
+                position.trade_id = await self.db.log_trade(signal, order)
                 
                 # Send notification
                 await self.discord.send_trade_notification(signal, order)
@@ -1128,7 +1148,10 @@ class TradingEngine:
                 self.indicators.indicator_config = self.config['trading']['indicators']
                 self.risk_manager.trading_config = self.config['trading']
                 self.risk_manager.risk_config = self.config['risk_management']
-                self.ai_assistant.config = self.config
+                if self.ai_assistant:
+                    self.ai_assistant.config = self.config
+                else:
+                    self.ensure_ai()
 
                 # Append changelog entry
                 os.makedirs("logs", exist_ok=True)
@@ -3,17 +3,38 @@ Ollama AI Service Integration
 Provides free, powerful AI capabilities for trading analysis
 """
 
+import asyncio
+import hashlib
+import re
+import httpx
 import requests
 import json
+from collections import OrderedDict
+from ollama import AsyncClient
 from typing import Dict, List, Optional, Any
 from loguru import logger
 import os
+import time
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON decoding for model replies (orjson when installed) and the outermost
+# {...} / [...] spans, used to pull JSON out of surrounding chatter
+_loads = orjson.loads if orjson else json.loads
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.S)
+
 
 class OllamaService:
     """Service wrapper for Ollama AI integration"""
     
+    # Completed generations kept for identical prompts (bounded LRU)
+    RESPONSE_CACHE_SIZE = 64
+    
     def __init__(self, base_url: str = None, model: str = "llama3.2:7b"):
         """
         Initialize Ollama service
@@ -25,14 +46,30 @@ class OllamaService:
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = model or os.getenv("OLLAMA_MODEL", "llama3.2:7b")
         self.available = False
+        # Seconds between availability re-probes made from the trading loop,
+        # and the bound on each probe (independent of the long generate timeout)
+        self.availability_ttl = 30.0
+        self.probe_timeout = 2.0
+        self._checked_at = 0.0
+        self._probe_task: Optional[asyncio.Task] = None
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
         try:
             self.timeout = float(os.getenv("OLLAMA_TIMEOUT", "90"))
         except ValueError:
             self.timeout = 90
+        # Keep the model loaded between the bot's periodic calls (Ollama unloads after 5m by default)
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
         self._check_availability()
+        # One pooled, keep-alive HTTP client shared by every call made from the event loop
+        self.client = AsyncClient(
+            host=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16, keepalive_expiry=60)
+        )
     
     def _check_availability(self) -> bool:
         """Check if Ollama is available"""
+        self._checked_at = time.monotonic()
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=10)
             if response.status_code == 200:
@@ -49,7 +86,29 @@ class OllamaService:
         """Check if Ollama service is available"""
         return self.available
     
-    def generate(self, prompt: str, system_prompt: str = None, temperature: float = 0.7, 
+    async def refresh_availability(self) -> bool:
+        """Return the cached availability, starting a background re-probe once availability_ttl has passed"""
+        if (time.monotonic() - self._checked_at >= self.availability_ttl
+                and (self._probe_task is None or self._probe_task.done())):
+            self._probe_task = asyncio.create_task(self._probe())
+        return self.available
+    
+    async def _probe(self):
+        """Probe /api/tags with a short timeout and record the result"""
+        try:
+            await asyncio.wait_for(self.client.list(), self.probe_timeout)
+            if not self.available:
+                logger.info(f"Ollama service available at {self.base_url}")
+            self.available = True
+        except Exception as e:
+            if self.available:
+                logger.warning(f"Ollama not available: {e}. AI features will use fallback methods.")
+            self.available = False
+        finally:
+            # Stamp on completion so the TTL counts from the answer, not the request
+            self._checked_at = time.monotonic()
+    
+    async def generate(self, prompt: str, system_prompt: str = None, temperature: float = 0.7, 
                  max_tokens: int = 1000) -> Optional[str]:
         """
         Generate text using Ollama
@@ -72,32 +131,39 @@ class OllamaService:
             if system_prompt:
                 full_prompt = f"{system_prompt}\n\n{prompt}"
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": full_prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
-                },
-                timeout=self.timeout
-            )
+            # Identical prompts (e.g. re-analysing an unchanged trade history)
+            # reuse the earlier answer instead of another LLM round-trip
+            cache_key = hashlib.blake2b(
+                f"{self.model}\0{temperature}\0{max_tokens}\0{full_prompt}".encode('utf-8'),
+                digest_size=16
+            ).hexdigest()
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached
             
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '').strip()
-            else:
-                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                return None
+            result = await self.client.generate(
+                model=self.model,
+                prompt=full_prompt,
+                stream=False,
+                keep_alive=self.keep_alive,
+                options={
+                    "temperature": temperature,
+                    "num_predict": max_tokens
+                }
+            )
+            text = (result['response'] or '').strip()
+            if text:
+                self._response_cache[cache_key] = text
+                if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+            return text
                 
         except Exception as e:
             logger.error(f"Error calling Ollama: {e}")
             return None
     
-    def chat(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Optional[str]:
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Optional[str]:
         """
         Chat with Ollama using message format
         
@@ -112,31 +178,22 @@ class OllamaService:
             return None
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature
-                    }
-                },
-                timeout=self.timeout
+            result = await self.client.chat(
+                model=self.model,
+                messages=messages,
+                stream=False,
+                keep_alive=self.keep_alive,
+                options={
+                    "temperature": temperature
+                }
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('message', {}).get('content', '').strip()
-            else:
-                logger.error(f"Ollama chat error: {response.status_code}")
-                return None
+            return (result['message']['content'] or '').strip()
                 
         except Exception as e:
             logger.error(f"Error in Ollama chat: {e}")
             return None
     
-    def analyze_trading_performance(self, trade_data: List[Dict], 
+    async def analyze_trading_performance(self, trade_data: List[Dict], 
                                    performance_metrics: Dict) -> Optional[Dict]:
         """
         Analyze trading performance using AI
@@ -177,13 +234,13 @@ Provide:
 3. Risk management recommendations
 4. Market condition assessment"""
         
-        response = self.generate(prompt, system_prompt, temperature=0.3)
+        response = await self.generate(prompt, system_prompt, temperature=0.3)
         
         if response:
             try:
                 # Try to parse as JSON if possible
                 if response.startswith('{'):
-                    return json.loads(response)
+                    return _loads(response)
                 else:
                     # Return as structured text
                     return {
@@ -198,7 +255,7 @@ Provide:
         
         return None
     
-    def detect_market_patterns(self, market_data: Dict, indicators: Dict) -> Optional[List[Dict]]:
+    async def detect_market_patterns(self, market_data: Dict, indicators: Dict) -> Optional[List[Dict]]:
         """
         Detect market patterns using AI
         
@@ -242,7 +299,7 @@ Identify:
 4. Risk assessment
 5. Recommended action"""
         
-        response = self.generate(prompt, system_prompt, temperature=0.4)
+        response = await self.generate(prompt, system_prompt, temperature=0.4)
         
         if response:
             # Parse response to extract patterns
@@ -267,7 +324,61 @@ Identify:
         
         return None
     
-    def optimize_parameters(self, current_params: Dict, performance_history: List[Dict]) -> Optional[Dict]:
+    async def detect_market_patterns_batch(self, snapshots: List[Dict]) -> Optional[Dict[str, List[Dict]]]:
+        """
+        Detect market patterns for several symbols in a single request
+        
+        Args:
+            snapshots: One dict per symbol with 'symbol', price stats and indicator values
+            
+        Returns:
+            Mapping of symbol to detected patterns (same shape as detect_market_patterns)
+            or None
+        """
+        if not self.available or not snapshots:
+            return None
+        
+        system_prompt = """You are an expert technical analyst. Identify chart patterns, candlestick
+patterns, divergences and trend signals for each market. Respond with JSON only."""
+        
+        prompt = f"""Analyze each market snapshot below and return a JSON array with one entry per
+symbol: {{"symbol": "...", "patterns": [{{"pattern": "...", "confidence": 0-1,
+"action": "buy|sell|hold", "reasoning": "..."}}]}}. Use an empty patterns array when
+nothing stands out.
+
+Snapshots:
+{json.dumps(snapshots)}"""
+        
+        response = await self.generate(
+            prompt, system_prompt, temperature=0.4, max_tokens=200 + 150 * len(snapshots)
+        )
+        if not response:
+            return None
+        
+        match = _JSON_ARRAY_RE.search(response)
+        if not match:
+            return None
+        try:
+            entries = _loads(match.group(0))
+        except ValueError:
+            return None
+        
+        results: Dict[str, List[Dict]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or 'symbol' not in entry:
+                continue
+            results[str(entry['symbol'])] = [
+                {
+                    'pattern': item.get('pattern', 'AI Pattern'),
+                    'confidence': item.get('confidence', 0.7),
+                    'action': str(item.get('action', 'hold')).lower(),
+                    'reasoning': str(item.get('reasoning', ''))[:200]
+                }
+                for item in (entry.get('patterns') or []) if isinstance(item, dict)
+            ]
+        return results
+    
+    async def optimize_parameters(self, current_params: Dict, performance_history: List[Dict]) -> Optional[Dict]:
         """
         Optimize trading parameters using AI
         
@@ -307,7 +418,7 @@ Suggest:
 3. Risk considerations
 4. Implementation priority"""
         
-        response = self.generate(prompt, system_prompt, temperature=0.3)
+        response = await self.generate(prompt, system_prompt, temperature=0.3)
         
         if response:
             return {
@@ -318,6 +429,119 @@ Suggest:
         
         return None
     
+    async def combined_analysis(self, trade_summary: Dict, performance_metrics: Dict,
+                                current_params: Dict, market_data: Dict = None,
+                                indicators: Dict = None) -> Optional[Dict]:
+        """
+        Run performance analysis, parameter optimization and (optionally) pattern
+        detection in a single Ollama request
+        
+        Args:
+            trade_summary: Fixed-size trade summary (n, avg_pnl, std_pnl, recent
+                (side, pnl) pairs) rather than the raw trade list
+            performance_metrics: Performance metrics dictionary
+            current_params: Current parameter values
+            market_data: Market data dictionary (enables the patterns section)
+            indicators: Technical indicators dictionary
+            
+        Returns:
+            Dict with 'performance', 'optimization' and 'patterns' keys, shaped like
+            the results of the individual helpers, or None
+        """
+        if not self.available:
+            return None
+        
+        system_prompt = """You are an expert quantitative trading analyst and optimization expert.
+Respond with a single JSON object only."""
+        
+        # Only aggregates and the parameter set go into the prompt (never the raw
+        # trade list) so it stays a few hundred tokens regardless of history size
+        prompt = f"""Analyze this trading performance and return a JSON object with keys
+"performance" (string: key insights, risk and market assessment),
+"optimization" (string: parameter adjustments with reasoning, using the parameter names below)
+and "patterns" (array of {{"pattern", "confidence" 0-1, "action" buy|sell|hold, "reasoning"}}).
+
+Performance Metrics:
+- Win Rate: {performance_metrics.get('win_rate', 0):.2%}
+- Total Trades: {performance_metrics.get('total_trades', 0)}
+- Net P&L: {performance_metrics.get('net_pnl', 0):.2f}
+- Profit Factor: {performance_metrics.get('profit_factor', 0):.2f}
+- Max Drawdown: {performance_metrics.get('max_drawdown', 0):.2f}
+
+Recent Trades: {trade_summary.get('n', 0)} trades, avg P&L {trade_summary.get('avg_pnl', 0):.4f}, std {trade_summary.get('std_pnl', 0):.4f}
+Last {len(trade_summary.get('recent', []))} trades (side, pnl): {json.dumps(trade_summary.get('recent', []))}
+
+Current Parameters:
+{json.dumps(current_params)}"""
+        
+        if market_data:
+            indicators = indicators or {}
+            prompt += f"""
+
+Market Data:
+- Current Price: {market_data.get('current_price', 'N/A')}
+- High: {market_data.get('high_24h', 'N/A')} Low: {market_data.get('low_24h', 'N/A')}
+- Volume: {market_data.get('volume_24h', 'N/A')}
+- RSI: {indicators.get('rsi', {}).get('value', 'N/A') if isinstance(indicators.get('rsi'), dict) else indicators.get('rsi', 'N/A')}"""
+        else:
+            prompt += "\n\nNo market snapshot is provided; return an empty patterns array."
+        
+        response = await self.generate(prompt, system_prompt, temperature=0.3, max_tokens=1500)
+        if not response:
+            return None
+        
+        data = None
+        match = _JSON_OBJECT_RE.search(response)
+        if match:
+            try:
+                data = _loads(match.group(0))
+            except ValueError:
+                data = None
+        if not isinstance(data, dict):
+            # Model ignored the JSON instruction; treat the reply as free text
+            data = {'performance': response, 'optimization': response, 'patterns': []}
+        
+        def as_text(value) -> str:
+            return value if isinstance(value, str) else json.dumps(value)
+        
+        timestamp = datetime.now().isoformat()
+        patterns = [
+            {
+                'pattern': item.get('pattern', 'AI Pattern'),
+                'confidence': item.get('confidence', 0.7),
+                'action': str(item.get('action', 'hold')).lower(),
+                'reasoning': str(item.get('reasoning', ''))[:200]
+            }
+            for item in (data.get('patterns') or []) if isinstance(item, dict)
+        ]
+        
+        return {
+            'performance': {
+                'analysis': as_text(data.get('performance', '')),
+                'timestamp': timestamp
+            },
+            'optimization': {
+                'suggestions': as_text(data.get('optimization', '')),
+                'timestamp': timestamp,
+                'current_params': current_params
+            },
+            'patterns': patterns
+        }
+    
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+        try:
+            close = getattr(self.client, 'close', None)
+            if close:
+                await close()
+            else:
+                # ollama < 0.6 has no public close(); shut the underlying httpx client
+                await self.client._client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Ollama client: {e}")
+    
     def get_available_models(self) -> List[str]:
         """Get list of available Ollama models"""
         if not self.available:
@@ -24,6 +24,19 @@ from loguru import logger
 import os
 import io
 import base64
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Chart export (kaleido) and PDF layout (ReportLab) are blocking and take
+# seconds; they run on this worker, one at a time, so the event loop keeps
+# serving Discord heartbeats and trading while a report renders
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-render")
+
+
+async def _render(func):
+    """Run a blocking render call on the report worker thread"""
+    return await asyncio.get_running_loop().run_in_executor(_render_executor, func)
 
 
 class ReportGenerator:
@@ -102,7 +115,7 @@ class ReportGenerator:
             story.extend(self._create_recommendations_section(recommendations))
             
             # Build PDF
-            doc.build(story)
+            await _render(partial(doc.build, story))
             
             logger.info(f"Daily report generated: {report_path}")
             return report_path
@@ -548,7 +561,7 @@ class ReportGenerator:
             )
             
             chart_path = os.path.join(self.charts_dir, f'equity_curve_{date.strftime("%Y%m%d")}.png')
-            fig.write_image(chart_path, width=800, height=400)
+            await _render(partial(fig.write_image, chart_path, width=800, height=400))
             
             return chart_path
         
@@ -578,7 +591,7 @@ class ReportGenerator:
             )
             
             chart_path = os.path.join(self.charts_dir, f'pnl_distribution_{date.strftime("%Y%m%d")}.png')
-            fig.write_image(chart_path, width=800, height=400)
+            await _render(partial(fig.write_image, chart_path, width=800, height=400))
             
             return chart_path
         
@@ -608,7 +621,7 @@ class ReportGenerator:
             )
             
             chart_path = os.path.join(self.charts_dir, f'pairs_performance_{date.strftime("%Y%m%d")}.png')
-            fig.write_image(chart_path, width=800, height=400)
+            await _render(partial(fig.write_image, chart_path, width=800, height=400))
             
             return chart_path
         
@@ -638,7 +651,7 @@ class ReportGenerator:
             )
             
             chart_path = os.path.join(self.charts_dir, f'hourly_activity_{date.strftime("%Y%m%d")}.png')
-            fig.write_image(chart_path, width=800, height=400)
+            await _render(partial(fig.write_image, chart_path, width=800, height=400))
             
             return chart_path
         
@@ -4,18 +4,20 @@ Test script for Ollama AI integration
 Verifies that Ollama service is working correctly
 """
 
+import asyncio
 import sys
 import os
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.ollama_service import OllamaService
 from loguru import logger
 
 def test_ollama_connection():
     """Test basic Ollama connection"""
+    return asyncio.run(_exercise_ollama())
+
+
+async def _exercise_ollama():
+    """Run the Ollama checks on one event loop (the async client is loop-bound)"""
     print("=" * 60)
     print("Testing Ollama AI Integration")
     print("=" * 60)
@@ -35,7 +37,7 @@ def test_ollama_connection():
     
     # Test basic generation
     print("\n2. Testing basic text generation...")
-    response = ollama.generate(
+    response = await ollama.generate(
         "What is 2+2? Answer in one sentence.",
         temperature=0.7
     )
@@ -51,7 +53,7 @@ def test_ollama_connection():
     messages = [
         {"role": "user", "content": "Hello! Can you help with trading analysis?"}
     ]
-    chat_response = ollama.chat(messages)
+    chat_response = await ollama.chat(messages)
     
     if chat_response:
         print(f"✅ Chat successful: {chat_response[:100]}...")
@@ -73,7 +75,7 @@ def test_ollama_connection():
         "profit_factor": 2.5
     }
     
-    analysis = ollama.analyze_trading_performance(trade_data, performance_metrics)
+    analysis = await ollama.analyze_trading_performance(trade_data, performance_metrics)
     if analysis:
         print("✅ Trading analysis successful")
         print(f"   Analysis: {str(analysis)[:200]}...")
@@ -95,7 +97,7 @@ def test_ollama_connection():
         "bb_lower": 49000
     }
     
-    patterns = ollama.detect_market_patterns(market_data, indicators)
+    patterns = await ollama.detect_market_patterns(market_data, indicators)
     if patterns:
         print(f"✅ Pattern detection successful: {len(patterns)} patterns found")
         for pattern in patterns: